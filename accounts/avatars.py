@@ -0,0 +1,153 @@
+"""
+Фоновая загрузка аватара из Telegram.
+
+Регистрация только создаёт пользователя и планирует загрузку
+(schedule_avatar_download) — медленный CDN Telegram не задерживает ответ.
+После фиксации транзакции фото скачивается в пуле потоков (работа сетевая,
+GIL не мешает), с повторами при сетевых ошибках, и приводится к квадрату
+AVATAR_SIZE в JPEG.
+
+Источник фото — settings.AVATAR_FETCHER (путь к функции url -> bytes).
+Для разработки и тестов без сети — fake_fetcher: рисует картинку локально.
+Число потоков — settings.AVATAR_DOWNLOAD_WORKERS; 0 — загружать в текущем потоке.
+"""
+import hashlib
+import io
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps
+
+from .models import User
+
+
+logger = logging.getLogger(__name__)
+
+# Сторона квадратного аватара в пикселях
+AVATAR_SIZE = 256
+AVATAR_QUALITY = 85
+FETCH_TIMEOUT = 5
+# Паузы перед повторными попытками, секунды
+RETRY_DELAYS = (1, 3, 9)
+
+_executor = None
+_executor_lock = threading.Lock()
+# Незавершённые загрузки, см. wait_for_avatars()
+_pending = set()
+
+
+class PermanentFetchError(Exception):
+    """Ошибка, которую повтор не исправит (например, 404)."""
+
+
+def http_fetcher(url):
+    try:
+        response = requests.get(url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+    except requests.HTTPError as exc:
+        if exc.response is not None and exc.response.status_code < 500:
+            raise PermanentFetchError(str(exc)) from exc
+        raise
+    return response.content
+
+
+def fake_fetcher(url):
+    """Локальная замена Telegram: однотонная картинка, цвет зависит от url."""
+    r, g, b = hashlib.md5(url.encode()).digest()[:3]
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (r, g, b)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def get_fetcher():
+    return import_string(getattr(settings, "AVATAR_FETCHER", "accounts.avatars.http_fetcher"))
+
+
+def resize_avatar(data):
+    """Квадрат AVATAR_SIZE x AVATAR_SIZE по центру, JPEG."""
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(data)))
+    image = ImageOps.fit(image.convert("RGB"), (AVATAR_SIZE, AVATAR_SIZE), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=AVATAR_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def fetch_with_retry(url):
+    fetcher = get_fetcher()
+    for attempt, delay in enumerate((*RETRY_DELAYS, None), start=1):
+        try:
+            return fetcher(url)
+        except PermanentFetchError:
+            raise
+        except Exception as exc:
+            if delay is None:
+                raise
+            logger.warning("Не удалось скачать аватар (попытка %s): %s", attempt, exc)
+            time.sleep(delay)
+
+
+def get_executor():
+    """Общий пул потоков; None, если загружать в текущем потоке."""
+    global _executor
+    workers = getattr(settings, "AVATAR_DOWNLOAD_WORKERS", 0)
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatars")
+        return _executor
+
+
+def schedule_avatar_download(user_id, url):
+    """Скачивает аватар пользователя после фиксации текущей транзакции."""
+    transaction.on_commit(lambda: _submit(user_id, url))
+
+
+def _submit(user_id, url):
+    executor = get_executor()
+    if executor is None:
+        download_avatar(user_id, url)
+        return
+    future = executor.submit(_run, user_id, url)
+    _pending.add(future)
+    future.add_done_callback(_pending.discard)
+
+
+def _run(user_id, url):
+    # Поток пула держит своё подключение к БД
+    try:
+        download_avatar(user_id, url)
+    finally:
+        close_old_connections()
+
+
+def download_avatar(user_id, url):
+    """Скачивает, уменьшает и сохраняет аватар; False, если не получилось."""
+    try:
+        data = resize_avatar(fetch_with_retry(url))
+    except Exception as exc:
+        logger.error("Аватар пользователя %s не загружен: %s", user_id, exc)
+        return False
+
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return False
+    name = user.photo.storage.save(
+        user.photo.field.generate_filename(user, f"tg_photo_{user.telegram_id}.jpg"), ContentFile(data)
+    )
+    # Фото, загруженное самим пользователем за это время, не перезаписываем
+    return bool(User.objects.filter(Q(photo="") | Q(photo__isnull=True), pk=user_id).update(photo=name))
+
+
+def wait_for_avatars(timeout=None):
+    """Ждёт завершения отправленных в пул загрузок."""
+    done, _ = wait(list(_pending), timeout=timeout)
+    return len(done)
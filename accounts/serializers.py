@@ -2,9 +2,8 @@ from rest_framework import serializers
 import uuid
 from .models import FootballExperience, FootballFrequency, FootballPosition, FootballFormat, User
 from django.conf import settings
-from django.core.files.base import ContentFile
+from .avatars import schedule_avatar_download
 from .utils import check_telegram_auth
-import requests
 import re
 
 class UserSerializer(serializers.ModelSerializer):
@@ -155,25 +154,10 @@ class RegisterSerializer(serializers.ModelSerializer):
         # Создаём пользователя
         user = User.objects.create_user(**validated_data)
         
-        # --- Обработка фотографии ---
+        # --- Фотография из Telegram скачивается в фоне, регистрация её не ждёт ---
         photo_url = user_data.get("photo_url")
         if photo_url:
-            try:
-                # Отправляем HTTP-запрос для скачивания изображения
-                response = requests.get(photo_url, stream=True, timeout=5)
-                response.raise_for_status()
-                
-                # Создаём имя файла
-                filename = f'tg_photo_{user.telegram_id}.jpg'
-                
-                # Создаём объект ContentFile из скачанного содержимого
-                content = ContentFile(response.content)
-                
-                # Присваиваем файл полю photo и сохраняем
-                user.photo.save(filename, content, save=True)
-                
-            except (requests.RequestException, Exception) as e:
-                print(f"Ошибка при загрузке фото из Telegram: {e}")
+            schedule_avatar_download(user.pk, photo_url)
 
         return user
 
@@ -200,3 +184,13 @@ def get_choices_from_enum(enum_class):
     из класса TextChoices.
     """
     return [{'value': choice[0], 'display_name': choice[1]} for choice in enum_class.choices]
+
+
+def get_football_choices():
+    """Все футбольные справочники анкеты пользователя."""
+    return {
+        'experience': get_choices_from_enum(FootballExperience),
+        'frequency': get_choices_from_enum(FootballFrequency),
+        'position': get_choices_from_enum(FootballPosition),
+        'format': get_choices_from_enum(FootballFormat),
+    }
@@ -0,0 +1,118 @@
+import hashlib
+import hmac
+import io
+import json
+import time
+from urllib.parse import urlencode
+
+import pytest
+from django.core.files.storage import default_storage
+from PIL import Image
+from rest_framework.test import APIClient
+
+from accounts import avatars
+from accounts.models import User
+
+
+BOT_TOKEN = "123:test-token"
+PHOTO_URL = "https://t.me/i/userpic/320/avatar.jpg"
+
+calls = []
+
+
+def flaky_fetcher(url):
+    """Первые две попытки падают, как медленный CDN."""
+    calls.append(url)
+    if len(calls) < 3:
+        raise ConnectionError("timeout")
+    return avatars.fake_fetcher(url)
+
+
+def missing_fetcher(url):
+    calls.append(url)
+    raise avatars.PermanentFetchError("404")
+
+
+def _init_data(user):
+    fields = {"auth_date": str(int(time.time())), "user": json.dumps(user)}
+    check_string = "\n".join(f"{key}={fields[key]}" for key in sorted(fields))
+    secret = hmac.new(b"WebAppData", BOT_TOKEN.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret, check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+@pytest.fixture(autouse=True)
+def avatar_settings(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    settings.TELEGRAM_BOT_TOKEN = BOT_TOKEN
+    settings.AVATAR_FETCHER = "accounts.avatars.fake_fetcher"
+    settings.AVATAR_DOWNLOAD_WORKERS = 0
+    monkeypatch.setattr(avatars, "RETRY_DELAYS", (0, 0, 0))
+    calls.clear()
+
+
+def _register():
+    return APIClient().post(
+        "/api/auth/register/",
+        {"initData": _init_data({"id": 777, "username": "tg_user", "photo_url": PHOTO_URL})},
+        format="json",
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_register_returns_before_avatar_and_pool_saves_it(settings):
+    settings.AVATAR_DOWNLOAD_WORKERS = 1
+
+    resp = _register()
+
+    assert resp.status_code == 201
+    avatars.wait_for_avatars(timeout=30)
+    user = User.objects.get(telegram_id="777")
+    assert user.photo.name.startswith("user/profile/avatar/")
+    with default_storage.open(user.photo.name) as f:
+        image = Image.open(f)
+        assert image.size == (avatars.AVATAR_SIZE, avatars.AVATAR_SIZE)
+        assert image.format == "JPEG"
+
+
+@pytest.mark.django_db
+def test_download_retries_transient_errors(monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(avatars, "get_fetcher", lambda: flaky_fetcher)
+    user = User.objects.create_user(username="flaky", password="x", telegram_id="1")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        avatars.schedule_avatar_download(user.pk, PHOTO_URL)
+
+    assert len(calls) == 3
+    user.refresh_from_db()
+    assert user.photo
+
+
+@pytest.mark.django_db
+def test_permanent_error_not_retried(monkeypatch):
+    monkeypatch.setattr(avatars, "get_fetcher", lambda: missing_fetcher)
+    user = User.objects.create_user(username="missing", password="x", telegram_id="2")
+
+    assert avatars.download_avatar(user.pk, PHOTO_URL) is False
+    assert len(calls) == 1
+    user.refresh_from_db()
+    assert not user.photo
+
+
+@pytest.mark.django_db
+def test_user_uploaded_photo_not_overwritten():
+    user = User.objects.create_user(username="own", password="x", telegram_id="3")
+    User.objects.filter(pk=user.pk).update(photo="user/profile/avatar/own.jpg")
+
+    assert avatars.download_avatar(user.pk, PHOTO_URL) is False
+    user.refresh_from_db()
+    assert user.photo.name == "user/profile/avatar/own.jpg"
+
+
+def test_resize_crops_to_square():
+    buffer = io.BytesIO()
+    Image.new("RGB", (1000, 400), (1, 2, 3)).save(buffer, "PNG")
+
+    resized = Image.open(io.BytesIO(avatars.resize_avatar(buffer.getvalue())))
+
+    assert resized.size == (avatars.AVATAR_SIZE, avatars.AVATAR_SIZE)
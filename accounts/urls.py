@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, AuthViewSet, FootballChoicesView, FootballExperienceView, FootballFrequencyView, FootballPositionView, FootballFormatView
+from .views import UserViewSet, AuthViewSet, BootstrapView, FootballChoicesView, FootballExperienceView, FootballFrequencyView, FootballPositionView, FootballFormatView
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='users')
@@ -8,6 +8,9 @@ router.register(r'auth', AuthViewSet, basename='auth')
 
 urlpatterns = [
     path('', include(router.urls)),
+
+    # Данные для старта WebApp одним запросом
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
     
     # Один эндпоинт для всех выборов
     path('auth/football-choices/', FootballChoicesView.as_view(), name='football-choices'),
@@ -8,9 +8,13 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from urllib.parse import unquote
 from django.core.exceptions import ObjectDoesNotExist
-from accounts.models import FootballExperience, FootballFormat, FootballFrequency, FootballPosition, User
 from djangoProject import settings
-from .serializers import UserSerializer, UpdateUserSerializer, RegisterSerializer, LoginSerializer, get_choices_from_enum
+from bookings.models import Booking
+from bookings.serializers import BookingSerializer
+from playgrounds.models import FavoriteSportVenue
+from djangoProject.utils import conditional_response
+from playgrounds.reference import REFERENCE_MAX_AGE, get_reference_data, reference_validators
+from .serializers import UserSerializer, UpdateUserSerializer, RegisterSerializer, LoginSerializer
 from .utils import check_telegram_auth
 from .models import User
 
@@ -156,35 +160,83 @@ class AuthViewSet(viewsets.ViewSet):
 
 
 
-class FootballExperienceView(APIView):
-    def get(self, request):
-        choices = get_choices_from_enum(FootballExperience)
-        return Response(choices)
+class FootballChoicesMixin:
+    """
+    Футбольные справочники из кэша справочников с ETag и публичным Cache-Control.
+    choice_name — ключ раздела (experience, frequency, ...); None — все разделы.
+    """
+    choice_name = None
 
-class FootballFrequencyView(APIView):
     def get(self, request):
-        choices = get_choices_from_enum(FootballFrequency)
-        return Response(choices)
+        etag, last_modified = reference_validators('football_choices', self.choice_name)
 
-class FootballPositionView(APIView):
-    def get(self, request):
-        choices = get_choices_from_enum(FootballPosition)
-        return Response(choices)
+        def respond():
+            choices = get_reference_data()['football_choices']
+            return Response(choices if self.choice_name is None else choices[self.choice_name])
 
-class FootballFormatView(APIView):
-    def get(self, request):
-        choices = get_choices_from_enum(FootballFormat)
-        return Response(choices)
+        return conditional_response(
+            request, etag, last_modified, respond,
+            cache_control={'public': True, 'max_age': REFERENCE_MAX_AGE},
+            vary=('Accept-Language',),
+        )
 
-class FootballChoicesView(APIView):
-    
+
+class FootballExperienceView(FootballChoicesMixin, APIView):
+    choice_name = 'experience'
+
+class FootballFrequencyView(FootballChoicesMixin, APIView):
+    choice_name = 'frequency'
+
+class FootballPositionView(FootballChoicesMixin, APIView):
+    choice_name = 'position'
+
+class FootballFormatView(FootballChoicesMixin, APIView):
+    choice_name = 'format'
+
+class FootballChoicesView(FootballChoicesMixin, APIView):
+    pass
+
+
+# Сколько последних броней отдавать при старте WebApp
+BOOTSTRAP_RECENT_BOOKINGS = 5
+
+
+class BootstrapView(APIView):
+    """
+    Всё, что нужно WebApp при запуске, одним запросом.
+    Справочники берутся из кэша, считаются только данные пользователя.
+    """
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Данные для старта WebApp: пользователь, регионы, типы площадок, "
+            "футбольные справочники, id избранных площадок и последние брони. "
+            "Без авторизации пользовательские поля пустые."
+        )
+    )
     def get(self, request):
-        data = {
-            'experience': get_choices_from_enum(FootballExperience),
-            'frequency': get_choices_from_enum(FootballFrequency),
-            'position': get_choices_from_enum(FootballPosition),
-            'format': get_choices_from_enum(FootballFormat),
-        }
+        data = dict(get_reference_data())
+        user = request.user
+        if not user.is_authenticated:
+            data.update({'user': None, 'favorite_ids': [], 'recent_bookings': []})
+            return Response(data)
+
+        bookings = (
+            Booking.objects.filter(user=user)
+            .select_related('stadium')
+            .prefetch_related('stadium__images')
+            .order_by('-created_at', 'id')[:BOOTSTRAP_RECENT_BOOKINGS]
+        )
+        data.update({
+            'user': UserSerializer(user).data,
+            'favorite_ids': list(
+                FavoriteSportVenue.objects.filter(user=user)
+                .order_by('-created_at', 'id')
+                .values_list('sport_venue_id', flat=True)
+            ),
+            'recent_bookings': BookingSerializer(bookings, many=True, context={'request': request}).data,
+        })
         return Response(data)
     
     
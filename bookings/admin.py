@@ -2,7 +2,9 @@ from django.utils import timezone
 from datetime import timedelta
 from django.contrib import admin
 from unfold.admin import ModelAdmin  # 🌈 добавляем Unfold
+from django.db import transaction
 from .models import Booking, Transaction
+from .occupancy import local_dates, rebuild_occupancy, refresh_booking_occupancy
 
 
 @admin.register(Booking)
@@ -62,6 +64,30 @@ class BookingAdmin(ModelAdmin):  # ✅ заменили admin.ModelAdmin → Mod
             qs = qs.filter(stadium__owner=request.user)
         return qs
 
+    def save_model(self, request, obj, form, change):
+        """Пересчитывает занятость и для старого, и для нового времени брони."""
+        previous = Booking.objects.filter(pk=obj.pk).first() if change else None
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if previous and previous.stadium_id != obj.stadium_id:
+                refresh_booking_occupancy(previous)
+            dates = local_dates(obj.start_time, obj.end_time)
+            if previous and previous.stadium_id == obj.stadium_id:
+                dates += local_dates(previous.start_time, previous.end_time)
+            rebuild_occupancy(obj.stadium_id, dates)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            refresh_booking_occupancy(obj)
+
+    def delete_queryset(self, request, queryset):
+        bookings = list(queryset)
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            for booking in bookings:
+                refresh_booking_occupancy(booking)
+
 
 @admin.register(Transaction)
 class TransactionAdmin(ModelAdmin):  # ✅ тоже заменили
@@ -0,0 +1,132 @@
+"""
+Архивация старых отменённых/просроченных броней в секционированные
+по месяцам таблицы bookings_bookingarchive / bookings_transactionarchive.
+
+Горячие таблицы Booking и Transaction остаются небольшими: в них живут
+только активные брони и история последних месяцев.
+"""
+import logging
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Booking
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_STATUSES = [Booking.STATUS_CANCELLED, Booking.STATUS_EXPIRED]
+
+# Таблица архива -> колонка секционирования
+ARCHIVE_TABLES = {
+    "bookings_bookingarchive": "start_time",
+    "bookings_transactionarchive": "created_at",
+}
+
+BOOKING_COLUMNS = (
+    "id, user_id, stadium_id, start_time, end_time, amount, payment_method, status, created_at"
+)
+TRANSACTION_COLUMNS = (
+    "id, booking_id, user_id, amount, status, external_id, created_at, updated_at"
+)
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def ensure_partitions(first_month, last_month):
+    """
+    Создаёт месячные секции архивных таблиц за период (включительно).
+    Уже существующие секции пропускаются. Возвращает имена созданных секций.
+    """
+    created = []
+    month = month_start(first_month)
+    last_month = month_start(last_month)
+    with connection.cursor() as cursor:
+        while month <= last_month:
+            next_month = add_months(month, 1)
+            for table in ARCHIVE_TABLES:
+                name = partition_name(table, month)
+                cursor.execute("SELECT to_regclass(%s)", [name])
+                if cursor.fetchone()[0]:
+                    continue
+                cursor.execute(
+                    f"CREATE TABLE {name} PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+                )
+                created.append(name)
+            month = next_month
+    return created
+
+
+def archive_cutoff(older_than_months):
+    """Первый день месяца, раньше которого брони уходят в архив."""
+    return add_months(month_start(timezone.localdate()), -older_than_months)
+
+
+def archivable_bookings(older_than_months):
+    cutoff = timezone.make_aware(datetime.combine(archive_cutoff(older_than_months), time.min))
+    return Booking.objects.filter(status__in=ARCHIVE_STATUSES, end_time__lt=cutoff)
+
+
+def archive_bookings(older_than_months=6, batch_size=1000):
+    """
+    Переносит отменённые/просроченные брони, закончившиеся раньше чем
+    older_than_months месяцев назад, вместе с их транзакциями в архив.
+    Работает пачками, каждая пачка — отдельная транзакция.
+    Возвращает количество перенесённых броней.
+    """
+    archivable = archivable_bookings(older_than_months)
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                archivable.select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            with connection.cursor() as cursor:
+                # Секции за месяцы переносимых строк (брони и их транзакции)
+                cursor.execute(
+                    "SELECT min(least(b.start_time, t.created_at)), "
+                    "max(greatest(b.start_time, t.created_at)) "
+                    "FROM bookings_booking b LEFT JOIN bookings_transaction t ON t.booking_id = b.id "
+                    "WHERE b.id = ANY(%s)",
+                    [ids],
+                )
+                first, last = cursor.fetchone()
+                ensure_partitions(first.date(), last.date())
+
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM bookings_transaction WHERE booking_id = ANY(%s) "
+                    f"RETURNING {TRANSACTION_COLUMNS}) "
+                    f"INSERT INTO bookings_transactionarchive ({TRANSACTION_COLUMNS}) "
+                    f"SELECT {TRANSACTION_COLUMNS} FROM moved",
+                    [ids],
+                )
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM bookings_booking WHERE id = ANY(%s) "
+                    f"RETURNING {BOOKING_COLUMNS}) "
+                    f"INSERT INTO bookings_bookingarchive ({BOOKING_COLUMNS}) "
+                    f"SELECT {BOOKING_COLUMNS} FROM moved",
+                    [ids],
+                )
+            moved += len(ids)
+            logger.info("Archived %s bookings (total %s)", len(ids), moved)
+
+    return moved
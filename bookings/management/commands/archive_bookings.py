@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from bookings.archive import archive_bookings, archivable_bookings
+
+
+class Command(BaseCommand):
+    help = 'Переносит старые отменённые/просроченные брони и их транзакции в архивные секции'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=6,
+            help='Архивировать брони, закончившиеся раньше чем N месяцев назад (по умолчанию 6)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Размер пачки (по умолчанию 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Показать количество броней для архивации, без выполнения',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archivable_bookings(options['months']).count()
+            self.stdout.write(
+                self.style.WARNING(f'Найдено {count} броней для архивации (dry-run)')
+            )
+            return
+
+        moved = archive_bookings(options['months'], options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Перенесено в архив {moved} броней')
+        )
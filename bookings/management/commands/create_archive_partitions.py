@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bookings.archive import add_months, ensure_partitions, month_start
+
+
+class Command(BaseCommand):
+    help = 'Создаёт месячные секции архивных таблиц броней и транзакций'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-back',
+            type=int,
+            default=24,
+            help='Сколько прошедших месяцев покрыть секциями (по умолчанию 24)',
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Сколько будущих месяцев покрыть секциями (по умолчанию 3)',
+        )
+
+    def handle(self, *args, **options):
+        current = month_start(timezone.localdate())
+        created = ensure_partitions(
+            add_months(current, -options['months_back']),
+            add_months(current, options['months_ahead']),
+        )
+
+        if not created:
+            self.stdout.write(self.style.SUCCESS('Все секции уже существуют'))
+            return
+
+        for name in created:
+            self.stdout.write(f'  + {name}')
+        self.stdout.write(self.style.SUCCESS(f'Создано секций: {len(created)}'))
@@ -0,0 +1,68 @@
+from collections import defaultdict
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from bookings.models import Booking, VenueOccupancy
+from bookings.occupancy import ACTIVE_STATUSES, add_interval, mask_to_bytes
+from playgrounds.cache import invalidate_venue
+from playgrounds.models import SportVenue
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересчитывает таблицу занятости площадок (VenueOccupancy) по активным броням'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stadium',
+            type=int,
+            help='Пересчитать только указанную площадку (ID)',
+        )
+        parser.add_argument(
+            '--from',
+            dest='date_from',
+            help='Пересчитать начиная с даты (YYYY-MM-DD)',
+        )
+
+    def handle(self, *args, **options):
+        bookings = Booking.objects.filter(status__in=ACTIVE_STATUSES)
+        occupancy = VenueOccupancy.objects.all()
+
+        if options['stadium']:
+            bookings = bookings.filter(stadium_id=options['stadium'])
+            occupancy = occupancy.filter(stadium_id=options['stadium'])
+
+        date_from = None
+        if options['date_from']:
+            try:
+                date_from = datetime.strptime(options['date_from'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Неверный формат даты. Используйте YYYY-MM-DD')
+            bookings = bookings.filter(end_time__date__gte=date_from)
+            occupancy = occupancy.filter(date__gte=date_from)
+
+        masks = defaultdict(lambda: defaultdict(int))
+        for stadium_id, start_time, end_time in bookings.values_list('stadium_id', 'start_time', 'end_time').iterator():
+            add_interval(masks[stadium_id], start_time, end_time)
+
+        rows = [
+            VenueOccupancy(stadium_id=stadium_id, date=date, slots=mask_to_bytes(mask))
+            for stadium_id, by_date in masks.items()
+            for date, mask in by_date.items()
+            if mask and (date_from is None or date >= date_from)
+        ]
+
+        with transaction.atomic():
+            occupancy.delete()
+            VenueOccupancy.objects.bulk_create(rows, batch_size=1000)
+
+            venues = SportVenue.objects.values_list('id', flat=True)
+            if options['stadium']:
+                venues = venues.filter(id=options['stadium'])
+            for venue_id in venues:
+                invalidate_venue(venue_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано {len(rows)} дней занятости')
+        )
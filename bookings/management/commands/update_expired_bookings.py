@@ -1,5 +1,8 @@
+from collections import defaultdict
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from bookings.models import Booking
+from bookings.occupancy import local_dates, rebuild_occupancy
 from django.utils import timezone
 
 
@@ -19,7 +22,7 @@ class Command(BaseCommand):
         # Находим все истекшие брони
         expired_bookings = Booking.objects.filter(
             end_time__lt=now,
-            status__in=['PENDING', 'CONFIRMED']
+            status=Booking.STATUS_PENDING
         )
         
         count = expired_bookings.count()
@@ -38,11 +41,19 @@ class Command(BaseCommand):
             )
             return
         
-        # Обновляем статус
-        updated_count = expired_bookings.update(
-            status='EXPIRED',
-            updated_at=now
-        )
+        # Обновляем статус и пересчитываем занятость затронутых дней
+        with transaction.atomic():
+            rows = list(expired_bookings.select_for_update().values_list('id', 'stadium_id', 'start_time', 'end_time'))
+            affected = defaultdict(set)
+            for _, stadium_id, start_time, end_time in rows:
+                affected[stadium_id].update(local_dates(start_time, end_time))
+
+            updated_count = Booking.objects.filter(
+                id__in=[row[0] for row in rows]
+            ).update(status=Booking.STATUS_EXPIRED)
+
+            for stadium_id, dates in affected.items():
+                rebuild_occupancy(stadium_id, dates)
         
         self.stdout.write(
             self.style.SUCCESS(
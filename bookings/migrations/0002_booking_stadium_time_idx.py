@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+        ('playgrounds', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['stadium', 'start_time', 'end_time'], name='booking_stadium_time_idx'),
+        ),
+    ]
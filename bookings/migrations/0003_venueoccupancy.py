@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:24
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_occupancy(apps, schema_editor):
+    """Маски занятости для уже существующих броней — доступность читает только VenueOccupancy."""
+    from bookings.occupancy import ACTIVE_STATUSES, add_interval, mask_to_bytes
+
+    Booking = apps.get_model('bookings', 'Booking')
+    VenueOccupancy = apps.get_model('bookings', 'VenueOccupancy')
+
+    masks = defaultdict(lambda: defaultdict(int))
+    bookings = Booking.objects.filter(status__in=ACTIVE_STATUSES).values_list('stadium_id', 'start_time', 'end_time')
+    for stadium_id, start_time, end_time in bookings.iterator():
+        add_interval(masks[stadium_id], start_time, end_time)
+
+    VenueOccupancy.objects.bulk_create(
+        [
+            VenueOccupancy(stadium_id=stadium_id, date=date, slots=mask_to_bytes(mask))
+            for stadium_id, by_date in masks.items()
+            for date, mask in by_date.items()
+            if mask
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_stadium_time_idx'),
+        ('playgrounds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('slots', models.BinaryField(max_length=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('stadium', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='occupancy', to='playgrounds.sportvenue')),
+            ],
+            options={
+                'unique_together': {('stadium', 'date')},
+            },
+        ),
+        migrations.RunPython(fill_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+CREATE_ARCHIVE_TABLES = """
+CREATE TABLE bookings_bookingarchive (
+    id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    stadium_id bigint NOT NULL,
+    start_time timestamp with time zone NOT NULL,
+    end_time timestamp with time zone NOT NULL,
+    amount numeric(12, 2) NOT NULL,
+    payment_method varchar(20) NULL,
+    status varchar(20) NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    archived_at timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, start_time)
+) PARTITION BY RANGE (start_time);
+CREATE TABLE bookings_bookingarchive_default PARTITION OF bookings_bookingarchive DEFAULT;
+CREATE INDEX bookings_bookingarchive_stadium_idx ON bookings_bookingarchive (stadium_id, start_time);
+CREATE INDEX bookings_bookingarchive_user_idx ON bookings_bookingarchive (user_id, start_time);
+
+CREATE TABLE bookings_transactionarchive (
+    id bigint NOT NULL,
+    booking_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    amount numeric(12, 2) NOT NULL,
+    status varchar(20) NOT NULL,
+    external_id varchar(100) NULL,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    archived_at timestamp with time zone NOT NULL DEFAULT now(),
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE bookings_transactionarchive_default PARTITION OF bookings_transactionarchive DEFAULT;
+CREATE INDEX bookings_transactionarchive_booking_idx ON bookings_transactionarchive (booking_id);
+"""
+
+DROP_ARCHIVE_TABLES = """
+DROP TABLE IF EXISTS bookings_transactionarchive;
+DROP TABLE IF EXISTS bookings_bookingarchive;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_booking_no_overlap'),
+        ('playgrounds', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_ARCHIVE_TABLES, DROP_ARCHIVE_TABLES),
+        migrations.CreateModel(
+            name='BookingArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('user_id', models.BigIntegerField()),
+                ('stadium_id', models.BigIntegerField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('payment_method', models.CharField(blank=True, max_length=20, null=True)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'bookings_bookingarchive',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='TransactionArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('booking_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(max_length=20)),
+                ('external_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'bookings_transactionarchive',
+                'managed': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['status', 'end_time'], name='booking_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='booking_created_brin'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='transaction_created_brin'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0005_archive_and_time_indexes'),
+        ('playgrounds', '0004_venue_price_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='booking_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='transaction_user_created_idx'),
+        ),
+    ]
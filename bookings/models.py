@@ -1,9 +1,17 @@
-from django.db import models
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import BrinIndex
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
 from playgrounds.models import SportVenue
 
 
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
 class Booking(models.Model):
     STATUS_PENDING = "pending"
     STATUS_CONFIRMED = "confirmed"
@@ -34,24 +42,60 @@ class Booking(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Поиск броней площадки за период (доступность, календарь)
+            models.Index(fields=["stadium", "start_time", "end_time"], name="booking_stadium_time_idx"),
+            # Истечение и архивация: status + end_time
+            models.Index(fields=["status", "end_time"], name="booking_status_end_idx"),
+            # Дашборды и история по дате создания (таблица пишется в хронологическом порядке)
+            BrinIndex(fields=["created_at"], name="booking_created_brin"),
+            # Лента броней пользователя (курсорная пагинация по -created_at, id)
+            models.Index(fields=["user", "-created_at", "id"], name="booking_user_created_idx"),
+        ]
+        constraints = [
+            # Активные брони одной площадки не могут пересекаться (GiST, btree_gist)
+            ExclusionConstraint(
+                name="booking_no_overlap",
+                expressions=[
+                    (TsTzRange("start_time", "end_time", RangeBoundary()), RangeOperators.OVERLAPS),
+                    ("stadium", RangeOperators.EQUAL),
+                ],
+                condition=models.Q(status__in=["pending", "confirmed"]),
+                violation_error_message="Это время уже забронировано.",
+            ),
+        ]
+
     def mark_expired(self):
+        from .occupancy import refresh_booking_occupancy
+
         if self.status == self.STATUS_PENDING and self.end_time < timezone.now():
-            self.status = self.STATUS_EXPIRED
-            self.save(update_fields=["status"])
+            with transaction.atomic():
+                self.status = self.STATUS_EXPIRED
+                self.save(update_fields=["status"])
+                refresh_booking_occupancy(self)
         return self
 
     def confirm_payment(self, external_id=None):
-        self.status = self.STATUS_CONFIRMED
-        self.save(update_fields=["status"])
-        self.transactions.update(
-            status=Transaction.STATUS_CONFIRMED,
-            external_id=external_id
-        )
+        from .occupancy import refresh_booking_occupancy
+
+        with transaction.atomic():
+            self.status = self.STATUS_CONFIRMED
+            self.save(update_fields=["status"])
+            self.transactions.update(
+                status=Transaction.STATUS_CONFIRMED,
+                external_id=external_id
+            )
+            refresh_booking_occupancy(self)
 
     def cancel_booking(self):
-        self.status = self.STATUS_CANCELLED
-        self.save(update_fields=["status"])
-        self.transactions.update(status=Transaction.STATUS_CANCELLED)
+        from .occupancy import refresh_booking_occupancy
+
+        with transaction.atomic():
+            self.status = self.STATUS_CANCELLED
+            self.save(update_fields=["status"])
+            self.transactions.update(status=Transaction.STATUS_CANCELLED)
+            refresh_booking_occupancy(self)
 
 
 class Transaction(models.Model):
@@ -78,6 +122,12 @@ class Transaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            BrinIndex(fields=["created_at"], name="transaction_created_brin"),
+            models.Index(fields=["user", "-created_at", "id"], name="transaction_user_created_idx"),
+        ]
+
     def confirm(self, external_id=None):
         self.status = self.STATUS_CONFIRMED
         if external_id:
@@ -87,3 +137,67 @@ class Transaction(models.Model):
     def cancel(self):
         self.status = self.STATUS_CANCELLED
         self.save(update_fields=["status", "updated_at"])
+
+
+class BookingArchive(models.Model):
+    """
+    Архив отменённых/просроченных броней (холодное хранилище).
+    Таблица секционирована по месяцам start_time и создаётся миграцией,
+    секции — командой create_archive_partitions / bookings.archive.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user_id = models.BigIntegerField()
+    stadium_id = models.BigIntegerField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    payment_method = models.CharField(max_length=20, null=True, blank=True)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "bookings_bookingarchive"
+
+
+class TransactionArchive(models.Model):
+    """Архив транзакций архивных броней, секционирован по месяцам created_at."""
+    id = models.BigIntegerField(primary_key=True)
+    booking_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=20)
+    external_id = models.CharField(max_length=100, null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "bookings_transactionarchive"
+
+
+class VenueOccupancy(models.Model):
+    """
+    Занятость площадки за локальный день (по Ташкенту) в виде битовой маски.
+    Бит i — слот длиной SLOT_MINUTES, начинающийся через i * SLOT_MINUTES минут после полуночи.
+    Поддерживается bookings.occupancy при каждом изменении активных броней.
+    """
+    SLOT_MINUTES = 15
+    SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+    stadium = models.ForeignKey(SportVenue, on_delete=models.CASCADE, related_name="occupancy")
+    date = models.DateField()
+    slots = models.BinaryField(max_length=SLOTS_PER_DAY // 8)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("stadium", "date")
+
+    def __str__(self):
+        return f"{self.stadium_id} {self.date}"
+
+    @property
+    def mask(self):
+        return int.from_bytes(bytes(self.slots), "big")
@@ -0,0 +1,125 @@
+"""
+Поддержка таблицы VenueOccupancy — битовых масок занятости площадок по дням.
+
+Маска дня пересчитывается целиком из активных броней (pending/confirmed),
+поэтому пересекающиеся брони и отмены обрабатываются корректно.
+Пересчёт выполняется под блокировкой строки площадки, чтобы параллельные
+брони одной площадки не затирали маски друг друга.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import pytz
+from django.db import transaction
+
+from playgrounds.cache import invalidate_venue
+from playgrounds.pubsub import publish_slots_changed
+from playgrounds.models import SportVenue
+from .models import Booking, VenueOccupancy
+
+
+VENUE_TZ = pytz.timezone("Asia/Tashkent")
+ACTIVE_STATUSES = [Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED]
+
+SLOT_MINUTES = VenueOccupancy.SLOT_MINUTES
+SLOTS_PER_DAY = VenueOccupancy.SLOTS_PER_DAY
+MASK_BYTES = SLOTS_PER_DAY // 8
+
+
+def local_dates(start_time, end_time):
+    """Локальные даты (по Ташкенту), которые затрагивает интервал [start_time, end_time)."""
+    date = start_time.astimezone(VENUE_TZ).date()
+    last = (end_time.astimezone(VENUE_TZ) - timedelta(microseconds=1)).date()
+    dates = []
+    while date <= last:
+        dates.append(date)
+        date += timedelta(days=1)
+    return dates
+
+
+def _day_start(date):
+    return VENUE_TZ.localize(datetime.combine(date, time(0, 0)))
+
+
+def add_interval(masks, start_time, end_time):
+    """
+    Отмечает интервал в словаре масок {date: int}.
+    Слоты, занятые хотя бы частично, считаются занятыми.
+    """
+    start_local = start_time.astimezone(VENUE_TZ)
+    end_local = end_time.astimezone(VENUE_TZ)
+    for date in local_dates(start_time, end_time):
+        day_start = _day_start(date)
+        start_min = max(0, (start_local - day_start).total_seconds() // 60)
+        end_min = min(24 * 60, (end_local - day_start).total_seconds() / 60)
+        first = int(start_min // SLOT_MINUTES)
+        last = int(-(-end_min // SLOT_MINUTES))  # округление вверх
+        if last > first:
+            masks[date] |= ((1 << (last - first)) - 1) << first
+
+
+def mask_to_bytes(mask):
+    return mask.to_bytes(MASK_BYTES, "big")
+
+
+def rebuild_occupancy(stadium_id, dates):
+    """
+    Пересчитывает маски площадки за указанные даты по активным броням.
+    Должна вызываться в той же транзакции, что и изменение брони.
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return
+
+    with transaction.atomic():
+        # Сериализуем пересчёты одной площадки
+        SportVenue.objects.select_for_update().filter(pk=stadium_id).exists()
+
+        window_start = _day_start(dates[0])
+        window_end = _day_start(dates[-1] + timedelta(days=1))
+        bookings = Booking.objects.filter(
+            stadium_id=stadium_id,
+            start_time__lt=window_end,
+            end_time__gt=window_start,
+            status__in=ACTIVE_STATUSES,
+        ).values_list("start_time", "end_time")
+
+        masks = defaultdict(int)
+        for start_time, end_time in bookings:
+            add_interval(masks, start_time, end_time)
+
+        empty_dates = [date for date in dates if not masks.get(date)]
+        if empty_dates:
+            VenueOccupancy.objects.filter(stadium_id=stadium_id, date__in=empty_dates).delete()
+
+        for date in dates:
+            if masks.get(date):
+                VenueOccupancy.objects.update_or_create(
+                    stadium_id=stadium_id,
+                    date=date,
+                    defaults={"slots": mask_to_bytes(masks[date])},
+                )
+
+        # Расписание площадки изменилось — сбрасываем кэш доступности
+        # и оповещаем открытые SSE-потоки
+        invalidate_venue(stadium_id)
+        publish_slots_changed(stadium_id, dates)
+
+
+def refresh_booking_occupancy(booking):
+    """Пересчитывает занятость дней, которые затрагивает бронь."""
+    rebuild_occupancy(booking.stadium_id, local_dates(booking.start_time, booking.end_time))
+
+
+def get_occupancy(stadium_id, date_from, date_to):
+    """Маски занятости площадки за период одним запросом: {date: int}."""
+    rows = VenueOccupancy.objects.filter(
+        stadium_id=stadium_id,
+        date__gte=date_from,
+        date__lte=date_to,
+    ).values_list("date", "slots")
+    masks = defaultdict(int)
+    for date, slots in rows:
+        masks[date] = int.from_bytes(bytes(slots), "big")
+    return masks
+
@@ -1,24 +1,45 @@
 from rest_framework import serializers
 from .models import Booking, Transaction
+from playgrounds.images import IMAGE_META_FIELDS, image_meta, variant_urls
 from playgrounds.models import SportVenue
+from playgrounds.serializers import media_url_builder
+from playgrounds.slots import MIN_BOOKING_MINUTES, is_on_grid, minutes_of, minutes_since
 import pytz
 from django.utils import timezone
-from datetime import datetime
+from datetime import datetime, time
 
 
 class SportVenuePreviewSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    image_meta = serializers.SerializerMethodField()
 
     class Meta:
         model = SportVenue
-        fields = ["id", "name", "image", "sport_venue_type"]
+        fields = ["id", "name", "image", "image_variants", "image_meta", "sport_venue_type"]
+
+    read_only_fields = ["id", "name", "image", "image_variants", "image_meta", "sport_venue_type"]
+
+    def _first_image(self, obj):
+        # Из prefetch_related("stadium__images"), без запроса на каждую бронь
+        return min(obj.images.all(), key=lambda image: image.id, default=None)
 
-    read_only_fields = ["id", "name", "image", "sport_venue_type"]
-    
     def get_image(self, obj):
-        first_image = obj.images.first()
+        first_image = self._first_image(obj)
         return first_image.image.url if first_image else None
 
+    def get_image_variants(self, obj):
+        first_image = self._first_image(obj)
+        if first_image is None:
+            return {}
+        return variant_urls(first_image.variants, first_image.image.name, media_url_builder(self.context))
+
+    def get_image_meta(self, obj):
+        first_image = self._first_image(obj)
+        if first_image is None:
+            return None
+        return image_meta({field: getattr(first_image, field) for field in IMAGE_META_FIELDS})
+
 
 class BookingSerializer(serializers.ModelSerializer):
     stadium = SportVenuePreviewSerializer(read_only=True)
@@ -74,27 +95,33 @@ class BookingCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Время окончания должно быть позже начала.")
 
         # Проверка: длительность хотя бы 1 час
-        if (end_time - start_time).total_seconds() < 3600:
+        if (end_time - start_time).total_seconds() < MIN_BOOKING_MINUTES * 60:
             raise serializers.ValidationError("Минимальная длительность брони — 1 час.")
 
-        # Рабочее время стадиона (Ташкент)
-        start_day = tz_tashkent.localize(datetime.combine(start_time.date(), stadium.open_time))
-        end_day = tz_tashkent.localize(datetime.combine(start_time.date(), stadium.close_time))
+        # Рабочее время стадиона (Ташкент), в минутах от начала дня брони
+        booking_date = start_time.astimezone(tz_tashkent).date()
+        day_start = tz_tashkent.localize(datetime.combine(booking_date, time(0, 0)))
+        open_min = minutes_of(stadium.open_time)
+        close_min = minutes_of(stadium.close_time)
+        start_min = minutes_since(day_start, start_time)
+        end_min = minutes_since(day_start, end_time)
 
         # Проверка, что бронь внутри рабочего времени
-        if start_time < start_day or end_time > end_day:
+        if start_min < open_min or end_min > close_min:
             raise serializers.ValidationError("Выбранное время вне рабочего графика площадки.")
 
-        # Проверка пересечений с другими бронями
-        conflicts = Booking.objects.filter(
-            stadium=stadium,
-            start_time__lt=end_time,
-            end_time__gt=start_time,
-            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED]
-        )
-        if conflicts.exists():
-            raise serializers.ValidationError("Это время уже забронировано.")
-
+        # Проверка: начало и конец на сетке слотов площадки
+        step = stadium.slot_minutes
+        if (
+            start_time.second or start_time.microsecond or end_time.second or end_time.microsecond or
+            not is_on_grid(start_min, open_min, close_min, step) or
+            not is_on_grid(end_min, open_min, close_min, step)
+        ):
+            raise serializers.ValidationError(
+                f"Время брони должно быть кратно {step} минутам от начала работы площадки."
+            )
+
+        # Пересечения с другими бронями проверяет БД при создании (services.create_booking)
         return data
 
 
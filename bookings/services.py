@@ -3,35 +3,39 @@ import logging
 from decimal import Decimal
 
 import requests
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from playgrounds.models import SportVenue
 
 from django.core.exceptions import ValidationError
 
 from .models import Booking, Transaction
+from .occupancy import refresh_booking_occupancy
 
 logger = logging.getLogger(__name__)
 
 
 
+OVERLAP_CONSTRAINT = "booking_no_overlap"
+
+
 class SlotAlreadyBooked(Exception):
     """Слот уже занят другим пользователем."""
     pass
 
+def _is_overlap_violation(exc: IntegrityError) -> bool:
+    diag = getattr(exc.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == OVERLAP_CONSTRAINT
+
+
 def create_booking(user, stadium: SportVenue, start_time, end_time, payment_method: str) -> Booking:
+    """
+    Создаёт бронь и транзакцию.
+    Пересечения проверяет сама БД (exclusion constraint booking_no_overlap).
+    """
     if start_time >= end_time:
         raise ValidationError({"detail": "Некорректное время бронирования"})
 
-    overlap_exists = Booking.objects.filter(
-        stadium=stadium,
-        status=Booking.STATUS_PENDING,
-        start_time__lt=end_time,
-        end_time__gt=start_time,
-    ).exists()
-    if overlap_exists:
-        raise SlotAlreadyBooked("Слот уже занят")
-
     duration_hours = Decimal((end_time - start_time).total_seconds()) / Decimal(3600)
     amount = duration_hours * stadium.price_per_hour
 
@@ -50,7 +54,12 @@ def create_booking(user, stadium: SportVenue, start_time, end_time, payment_meth
                 user=user,
                 amount=amount,
             )
+            refresh_booking_occupancy(booking)
         return booking
+    except IntegrityError as exc:
+        if _is_overlap_violation(exc):
+            raise SlotAlreadyBooked("Слот уже занят")
+        raise ValidationError({"detail": f"Ошибка при создании брони: {exc}"})
     except Exception as exc:
         raise ValidationError({"detail": f"Ошибка при создании брони: {exc}"})
 
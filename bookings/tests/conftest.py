@@ -4,15 +4,15 @@ from django.utils import timezone
 from decimal import Decimal
 
 # Подстрой под реальный модуль стадионов в проекте
-from playgrounds.models import Stadium
+from playgrounds.models import SportVenue as Stadium
 
 User = get_user_model()
 
 
 @pytest.fixture
 def user(db):
-    # Создаём пользователя с telegram_chat_id (используется в сервисах)
-    return User.objects.create_user(username="testuser", password="pass123", telegram_chat_id=123456789)
+    # Создаём пользователя с telegram_id (используется в сервисах)
+    return User.objects.create_user(username="testuser", password="pass123", telegram_id="123456789")
 
 
 @pytest.fixture
@@ -0,0 +1,27 @@
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+
+from bookings.models import Booking, BookingArchive, Transaction, TransactionArchive
+
+
+@pytest.mark.django_db
+def test_archive_bookings_moves_old_inactive_rows(user, stadium):
+    old_start = timezone.now() - timezone.timedelta(days=400)
+    old = Booking.objects.create(user=user, stadium=stadium, start_time=old_start,
+                                 end_time=old_start + timezone.timedelta(hours=1),
+                                 amount=Decimal("50000.00"), status=Booking.STATUS_CANCELLED)
+    Transaction.objects.create(booking=old, user=user, amount=old.amount, status=Transaction.STATUS_CANCELLED)
+    # Подтверждённые брони в архив не уходят
+    kept = Booking.objects.create(user=user, stadium=stadium, start_time=old_start + timezone.timedelta(days=1),
+                                  end_time=old_start + timezone.timedelta(days=1, hours=1),
+                                  amount=Decimal("50000.00"), status=Booking.STATUS_CONFIRMED)
+
+    call_command("archive_bookings", months=6)
+
+    assert not Booking.objects.filter(id=old.id).exists()
+    assert not Transaction.objects.filter(booking_id=old.id).exists()
+    assert BookingArchive.objects.filter(id=old.id, status=Booking.STATUS_CANCELLED).exists()
+    assert TransactionArchive.objects.filter(booking_id=old.id).exists()
+    assert Booking.objects.filter(id=kept.id).exists()
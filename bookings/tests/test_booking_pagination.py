@@ -0,0 +1,29 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Booking
+
+
+@pytest.mark.django_db
+def test_user_bookings_cursor_pagination_newest_first(user, stadium):
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    start = timezone.now() + timedelta(days=1)
+    bookings = [
+        Booking.objects.create(user=user, stadium=stadium, start_time=start + timedelta(hours=2 * i),
+                               end_time=start + timedelta(hours=2 * i + 1), amount=Decimal("1"))
+        for i in range(5)
+    ]
+
+    page = client.get("/api/bookings/", {"cursor": "", "page_size": 2}).json()
+    assert "count" not in page
+    seen = [b["id"] for b in page["results"]]
+    while page["next"]:
+        page = client.get(page["next"]).json()
+        seen += [b["id"] for b in page["results"]]
+
+    assert seen == [b.id for b in sorted(bookings, key=lambda b: (b.created_at, -b.id), reverse=True)]
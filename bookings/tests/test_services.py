@@ -144,3 +144,30 @@ def test_handle_successful_payment_no_pending_transaction_returns_error():
     res = services.handle_successful_payment("payload_missing", {"provider_payment_charge_id": "tx-1"})
     assert res["ok"] is False
     assert res["reason"] == "transaction_not_found"
+
+
+@pytest.mark.django_db
+def test_create_booking_overlap_raises_slot_already_booked(user, stadium):
+    start = timezone.now() + timezone.timedelta(days=1)
+    end = start + timezone.timedelta(hours=2)
+    services.create_booking(user=user, stadium=stadium, start_time=start, end_time=end,
+                            payment_method=Booking.PAYMENT_CASH)
+
+    # Пересечение ловит exclusion constraint в БД
+    with pytest.raises(services.SlotAlreadyBooked):
+        services.create_booking(user=user, stadium=stadium, start_time=start + timezone.timedelta(hours=1),
+                                end_time=end + timezone.timedelta(hours=1), payment_method=Booking.PAYMENT_CASH)
+    assert Booking.objects.filter(stadium=stadium).count() == 1
+
+
+@pytest.mark.django_db
+def test_create_booking_allows_slot_of_cancelled_booking(user, stadium):
+    start = timezone.now() + timezone.timedelta(days=1)
+    end = start + timezone.timedelta(hours=1)
+    first = services.create_booking(user=user, stadium=stadium, start_time=start, end_time=end,
+                                    payment_method=Booking.PAYMENT_CASH)
+    first.cancel_booking()
+
+    second = services.create_booking(user=user, stadium=stadium, start_time=start, end_time=end,
+                                     payment_method=Booking.PAYMENT_CASH)
+    assert second.status == Booking.STATUS_PENDING
@@ -35,6 +35,7 @@ class BookingViewSet(
     viewsets.GenericViewSet
 ):
     serializer_class = BookingSerializer
+    cursor_ordering = ("-created_at", "id")
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -44,7 +45,12 @@ class BookingViewSet(
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False) or self.request.user.is_anonymous:
             return Booking.objects.none()
-        return Booking.objects.filter(user=self.request.user).order_by("-created_at")
+        return (
+            Booking.objects.filter(user=self.request.user)
+            .select_related("stadium")
+            .prefetch_related("stadium__images")
+            .order_by("-created_at")
+        )
 
     def perform_create(self, serializer):
         payment_method = self.request.data.get("payment_method", Booking.PAYMENT_CASH)
@@ -138,6 +144,7 @@ class BookingViewSet(
 class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "id")
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -5,6 +5,7 @@ from .views.dashboard import DashboardView
 from .views.sportvenue import AdminSportVenueViewSet
 from .views.user import UserManagementViewSet
 from .views.bookings import BookingViewSet
+from .views.cache import CacheStatsView
 
 router = DefaultRouter()
 router.register(r'auth', AdminAuthViewSet, basename='admin-auth')
@@ -15,4 +16,5 @@ router.register(r'users', UserManagementViewSet, basename='user-management')
 urlpatterns = [
     path('admin-panel/', include(router.urls)),
     path('admin-panel/dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('admin-panel/cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
 ]
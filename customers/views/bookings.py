@@ -15,6 +15,7 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['status', 'stadium', 'start_time', 'end_time']
     ordering_fields = ['date', 'created_at']
     search_fields = ['client__full_name', 'client__phone']
+    cursor_ordering = ('-created_at', 'id')
 
     def get_queryset(self):
         user = self.request.user
@@ -23,10 +24,10 @@ class BookingViewSet(viewsets.ReadOnlyModelViewSet):
             return Booking.objects.none()
         
         if user.is_superuser or user.role == Role.SUPERADMIN:
-            return Booking.objects.all().select_related('user', 'stadium')
+            return Booking.objects.all().select_related('user', 'stadium').prefetch_related('stadium__images')
 
         if getattr(user, "is_owner", False) or user.role == Role.OWNER:
-            return Booking.objects.filter(field__owner=user).select_related('user', 'stadium')
+            return Booking.objects.filter(field__owner=user).select_related('user', 'stadium').prefetch_related('stadium__images')
 
         return Booking.objects.none()
     
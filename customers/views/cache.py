@@ -0,0 +1,21 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+
+from playgrounds.cache import get_cache_stats
+from ..permissions import IsSuperAdmin
+
+
+class CacheStatsView(APIView):
+    """
+    Счётчики попаданий/промахов кэша доступности площадок.
+    Доступно только супер-админам.
+    """
+    permission_classes = [IsSuperAdmin]
+
+    @swagger_auto_schema(
+        operation_summary="Статистика кэша доступности",
+        operation_description="Возвращает количество попаданий и промахов кэша available-time / available-range.",
+    )
+    def get(self, request):
+        return Response({"availability": get_cache_stats()})
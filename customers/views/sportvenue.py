@@ -6,12 +6,22 @@ from playgrounds.models import SportVenue
 from playgrounds.serializers import SportVenueSerializer
 from ..permissions import IsOwnerOrSuperAdmin
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
-from playgrounds.models import SportVenue
-from playgrounds.serializers import SportVenueSerializer
+from django.db import transaction
+from playgrounds.models import SportVenue, SportVenueImage
+from playgrounds.serializers import SportVenueImageSerializer, SportVenueSerializer
+from playgrounds.uploads import schedule_image_processing
 from accounts.models import Role
 
 
+# Пакетная загрузка фото
+MAX_BULK_IMAGES = 20
+MAX_IMAGE_SIZE = 15 * 1024 * 1024
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
 class AdminSportVenueViewSet(viewsets.ModelViewSet):
     """
     ViewSet для владельцев полей и супер-админов.
@@ -20,6 +30,7 @@ class AdminSportVenueViewSet(viewsets.ModelViewSet):
 
     serializer_class = SportVenueSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrSuperAdmin]
+    cursor_ordering = ('-created_at', 'id')
 
     def get_queryset(self):
         # --- Если Swagger вызывает view — вернуть пустой QuerySet, чтобы не падало ---
@@ -90,3 +101,49 @@ class AdminSportVenueViewSet(viewsets.ModelViewSet):
         if not request.user.is_authenticated:
             return Response({"detail": "Авторизация обязательна."}, status=status.HTTP_401_UNAUTHORIZED)
         return super().destroy(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        method='post',
+        operation_summary="Загрузить несколько фото поля",
+        operation_description=(
+            "Принимает multipart/form-data с файлами в поле images (до 20 файлов, до 15 МБ каждый). "
+            "Оригиналы сохраняются сразу, копии и метаданные строятся в фоне — ответ 202. "
+            "Файлы, которые не удалось открыть как изображение, удаляются при обработке."
+        ),
+        manual_parameters=[
+            openapi.Parameter('images', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True,
+                              description='Фотографии (можно несколько)'),
+        ],
+        responses={202: SportVenueImageSerializer(many=True), 400: "Ошибка валидации"},
+    )
+    @action(detail=True, methods=['post'], url_path='images', parser_classes=[MultiPartParser])
+    def upload_images(self, request, pk=None):
+        venue = self.get_object()
+        files = request.FILES.getlist('images')
+        if not files:
+            return Response({"detail": "Передайте файлы в поле images."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(files) > MAX_BULK_IMAGES:
+            return Response({"detail": f"Не больше {MAX_BULK_IMAGES} фото за раз."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        errors = {}
+        for upload in files:
+            if not upload.name.lower().endswith(IMAGE_EXTENSIONS):
+                errors[upload.name] = "Допустимые форматы: " + ", ".join(IMAGE_EXTENSIONS)
+            elif upload.size > MAX_IMAGE_SIZE:
+                errors[upload.name] = f"Файл больше {MAX_IMAGE_SIZE // (1024 * 1024)} МБ"
+        if errors:
+            return Response({"detail": "Некоторые файлы не подходят.", "files": errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # Большие файлы Django уже записал во временные — сохранение их только перемещает
+        with transaction.atomic():
+            images = []
+            for upload in files:
+                image = SportVenueImage(sport_venue=venue, image=upload)
+                image.save(process=False)
+                images.append(image)
+            schedule_image_processing(image.pk for image in images)
+
+        serializer = SportVenueImageSerializer(images, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
@@ -21,6 +21,7 @@ class UserManagementViewSet(viewsets.ModelViewSet):
     filterset_fields = ['role', 'city']
     search_fields = ['username', 'first_name', 'last_name', 'phone']
     ordering_fields = ['date_joined', 'username']
+    cursor_ordering = ('-date_joined', 'id')
 
     def create(self, request, *args, **kwargs):
         """
@@ -0,0 +1,75 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация с порядком, заданным вьюхой (см. HybridPagination)."""
+
+    def __init__(self, ordering, page_size):
+        self.ordering = ordering
+        self.page_size = page_size
+
+    def get_ordering(self, request, queryset, view):
+        return self.ordering
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Пагинация по умолчанию для всех списков.
+
+    Без параметров — номера страниц (?page=N, с count), как раньше.
+    С ?cursor= (пустой курсор — первая страница) или ?pagination=cursor — keyset
+    по стабильному порядку вьюхи: стоимость страницы не растёт с глубиной,
+    а COUNT(*) выполняется только при ?with_count=1.
+
+    Порядок задаётся во вьюхе атрибутом cursor_ordering (последнее поле — id
+    для однозначности) или методом get_cursor_ordering(queryset).
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    cursor_query_param = 'cursor'
+    default_cursor_ordering = ('-created_at', 'id')
+
+    keyset = None
+
+    def use_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params or
+            request.query_params.get('pagination') == 'cursor'
+        )
+
+    def get_cursor_ordering(self, queryset, view):
+        if hasattr(view, 'get_cursor_ordering'):
+            return view.get_cursor_ordering(queryset)
+        return getattr(view, 'cursor_ordering', self.default_cursor_ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_cursor(request):
+            self.keyset = None
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        self.count = None
+        if request.query_params.get('with_count') in ('1', 'true'):
+            self.count = queryset.count()
+
+        self.keyset = KeysetPagination(self.get_cursor_ordering(queryset, view), page_size)
+        return self.keyset.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+
+        payload = {
+            'next': self.keyset.get_next_link(),
+            'previous': self.keyset.get_previous_link(),
+        }
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['results'] = data
+        return Response(payload)
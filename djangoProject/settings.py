@@ -25,6 +25,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
@@ -103,6 +104,37 @@ DATABASES = {
 #     }
 # }
 
+# Кэш: по умолчанию в памяти процесса. Для нескольких воркеров/серверов
+# задайте REDIS_URL (нужен пакет redis), иначе версии и счётчики кэша будут у каждого свои.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'polya',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'polya-default',
+        }
+    }
+
+# Живые обновления слотов (SSE): между воркерами сообщения ходят через Redis
+if REDIS_URL:
+    LIVE_UPDATES = {
+        'BACKEND': 'playgrounds.pubsub.RedisBroker',
+        'OPTIONS': {'url': REDIS_URL},
+    }
+else:
+    LIVE_UPDATES = {
+        'BACKEND': 'playgrounds.pubsub.LocalBroker',
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -145,6 +177,25 @@ STATIC_ROOT = BASE_DIR / 'static'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    # Медиа называются по хэшу содержимого: одинаковые загрузки хранятся один раз,
+    # а nginx кэширует файлы навсегда (см. djangoProject/storage.py)
+    "default": {
+        "BACKEND": "djangoProject.storage.ContentAddressedStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Пакетная загрузка фото: обработка Pillow в пуле процессов (0 — в процессе приложения)
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', 2))
+
+# Аватары из Telegram: загрузка в пуле потоков (0 — в текущем потоке).
+# Без сети: AVATAR_FETCHER=accounts.avatars.fake_fetcher
+AVATAR_DOWNLOAD_WORKERS = int(os.getenv('AVATAR_DOWNLOAD_WORKERS', 2))
+AVATAR_FETCHER = os.getenv('AVATAR_FETCHER', 'accounts.avatars.http_fetcher')
+
 AUTH_USER_MODEL = 'accounts.User'
 
 AUTHENTICATION_BACKENDS = [
@@ -164,7 +215,7 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'djangoProject.pagination.HybridPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_ORDERING': ['-created_at'],
 }
@@ -270,9 +321,6 @@ CORS_ALLOWED_ORIGIN_REGEXES = [
 ]
 
 
-
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
 # Telegram Bot Settings
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
@@ -0,0 +1,52 @@
+import hashlib
+import os
+import re
+
+from django.core.files.storage import FileSystemStorage
+
+
+# Имя файла — SHA-256 содержимого (64 hex-символа) и исходное расширение
+HASHED_NAME_RE = re.compile(r"(^|/)[0-9a-f]{64}(\.[A-Za-z0-9]+)?$")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище медиа, в котором файл называется по хэшу своего содержимого
+    в каталоге upload_to: sport_venue_images/<sha256>.jpg.
+
+    Одинаковые загрузки хранятся один раз, а файл под одним и тем же именем
+    никогда не меняется — nginx отдаёт такие файлы с Cache-Control: immutable.
+    Раскладка MEDIA_ROOT прежняя, старые файлы с исходными именами продолжают
+    отдаваться (переименование — команда hash_media_files).
+
+    Один файл может принадлежать нескольким записям, поэтому удалять его
+    через delete() можно, только если ссылок на него больше нет.
+    """
+
+    @staticmethod
+    def is_hashed(name):
+        return bool(HASHED_NAME_RE.search(name))
+
+    def hashed_name(self, name, content):
+        digest = hashlib.sha256()
+        if hasattr(content, "seek"):
+            content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, "seek"):
+            content.seek(0)
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        return os.path.join(directory, digest.hexdigest() + extension).replace("\\", "/")
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            # Такой файл уже загружен — второй раз не пишем
+            return name
+        saved = super()._save(name, content)
+        if saved != name:
+            # Параллельная загрузка того же файла успела раньше: FileSystemStorage
+            # сохранил копию под другим именем, она не нужна
+            self.delete(saved)
+        return name
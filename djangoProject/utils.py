@@ -5,7 +5,9 @@ from operator import itemgetter
 from urllib.parse import parse_qsl
 
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 
 def csrf_exempt_api(view_class):
     for method in ['dispatch']:
@@ -34,4 +36,28 @@ def parse_telegram_init_data(init_data: str):
         user_data = json.loads(user_json)
         return user_data
     except Exception:
-        return None
\ No newline at end of file
+        return None
+
+
+def conditional_response(request, etag, last_modified, respond, cache_control=None, vary=()):
+    """
+    Условный GET: если клиент прислал актуальный ETag (или Last-Modified),
+    отдаёт 304 без запросов к БД и сериализации, иначе — ответ respond().
+    cache_control — параметры Cache-Control (по умолчанию no-cache:
+    клиент обязан перепроверять ответ при каждом запросе).
+    """
+    cache_control = cache_control or {'no_cache': True}
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        patch_cache_control(not_modified, **cache_control)
+        patch_vary_headers(not_modified, vary)
+        return not_modified
+
+    response = respond()
+    if response.status_code == 200:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, **cache_control)
+        patch_vary_headers(response, vary)
+    return response
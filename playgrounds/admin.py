@@ -2,6 +2,7 @@ from django.utils.html import format_html
 from unfold.admin import ModelAdmin
 from django.contrib import admin
 from .models import SportVenue, SportVenueImage, SportVenueType, Region, FavoriteSportVenue
+from .search import build_search_query
 
 
 class SportVenueImageInline(admin.TabularInline):
@@ -12,7 +13,7 @@ class SportVenueImageInline(admin.TabularInline):
 
     def preview_image(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height:100px; border-radius:8px;"/>', obj.image.url)
+            return format_html('<img src="{}" style="max-height:100px; border-radius:8px;"/>', obj.variant_url('thumb'))
         return 'Нет изображения'
 
     preview_image.short_description = 'Превью'
@@ -35,14 +36,25 @@ class SportVenueAdmin(ModelAdmin):  # <— Unfold admin
         ('Локация', {
             'fields': ('region', 'address', 'latitude', 'longitude', 'yandex_map_url')
         }),
+        ('Расписание', {
+            'fields': ('open_time', 'close_time', 'slot_minutes')
+        }),
     )
 
     @admin.display(description='Превью')
     def image_preview(self, obj):
-        if obj.images.exists():
-            return format_html('<img src="{}" style="max-height:100px; border-radius:8px;"/>', obj.images.first().image.url)
+        image = obj.images.order_by('id').first()
+        if image is not None:
+            return format_html('<img src="{}" style="max-height:100px; border-radius:8px;"/>', image.variant_url('thumb'))
         return 'Нет изображений'
 
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по GIN-индексу вместо icontains по трём колонкам
+        query = build_search_query(search_term)
+        if query is None:
+            return queryset, False
+        return queryset.filter(search_vector=query), False
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.role == 'owner':
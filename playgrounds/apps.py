@@ -12,3 +12,5 @@ class PlaygroundsConfig(AppConfig):
             Region.ensure_test_regions()
             SportVenueType.ensure_test_types()
         post_migrate.connect(fill_test_data, sender=self)
+
+        from . import signals  # noqa: F401
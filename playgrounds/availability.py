@@ -0,0 +1,44 @@
+from datetime import datetime, time
+
+from bookings.occupancy import SLOT_MINUTES, VENUE_TZ, get_occupancy
+from .slots import build_points, has_free_slot, mask_to_intervals, minutes_of, minutes_since
+
+
+# Максимальная длина периода для календаря (в днях)
+MAX_RANGE_DAYS = 31
+
+
+def get_busy_intervals(sport_venue, date_from, date_to):
+    """
+    Возвращает занятые интервалы (минуты от полуночи по Ташкенту) за период
+    по таблице занятости: {date: [(start, end), ...]}.
+    """
+    masks = get_occupancy(sport_venue.pk, date_from, date_to)
+    return {date: mask_to_intervals(mask, SLOT_MINUTES) for date, mask in masks.items()}
+
+
+def build_time_points(sport_venue, date, busy, user_tz, now):
+    """
+    Формирует временные точки площадки на дату с шагом площадки (включая закрытие).
+
+    busy — занятые интервалы этого дня по Ташкенту.
+    Возвращает (time_points, is_fully_booked).
+    """
+    day_start = VENUE_TZ.localize(datetime.combine(date, time(0, 0)))
+    points = build_points(
+        minutes_of(sport_venue.open_time),
+        minutes_of(sport_venue.close_time),
+        sport_venue.slot_minutes,
+        busy,
+        now_min=minutes_since(day_start, now),
+    )
+
+    slots = []
+    for minute, is_available in points:
+        slot_tashkent = VENUE_TZ.localize(datetime.combine(date, time(minute // 60, minute % 60)))
+        slots.append({
+            "time": slot_tashkent.astimezone(user_tz).strftime("%H:%M"),
+            "is_available": is_available
+        })
+
+    return slots, not has_free_slot(points)
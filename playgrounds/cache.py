@@ -0,0 +1,214 @@
+"""
+Кэш ответов доступности площадок.
+
+Ключи включают версию площадки — счётчик, который увеличивается при каждом
+изменении её расписания (создание/отмена/оплата/истечение брони, правка площадки).
+Поэтому старые записи не удаляются явно: они просто перестают читаться
+и вытесняются по таймауту.
+
+Те же версии дают ETag для условных GET-запросов (304 Not Modified):
+версия площадки — для карточки и доступности, версия каталога
+(любая правка площадок, фото, регионов, типов) — для карты, версия
+справочников (регионы, типы) — для справочных данных.
+
+Бэкенд — стандартный кэш Django (CACHES["default"]): в разработке locmem,
+в продакшене стоит подключить общий (Redis), иначе у каждого воркера gunicorn
+будут свои версии и счётчики.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .slots import MIN_SLOT_MINUTES
+
+
+VERSION_KEY = "venue:{}:version"
+MODIFIED_KEY = "venue:{}:modified"
+CATALOG_VERSION_KEY = "venues:version"
+CATALOG_MODIFIED_KEY = "venues:modified"
+REFERENCE_VERSION_KEY = "reference:version"
+REFERENCE_MODIFIED_KEY = "reference:modified"
+FAVORITES_VERSION_KEY = "user:{}:favorites:version"
+FAVORITES_MODIFIED_KEY = "user:{}:favorites:modified"
+AVAILABILITY_KEY = "availability:{}:v{}:{}"
+STATS_KEY = "availability:stats:{}"
+
+# Записи на будущие даты живут до смены версии, таймаут лишь ограничивает память
+AVAILABILITY_TIMEOUT = 60 * 60 * 24
+
+
+def _initial_version():
+    # Начинаем с текущего времени, чтобы после перезапуска не совпасть со старыми ключами
+    return int(time.time() * 1000)
+
+
+def _get_version(key, modified_key):
+    version = cache.get(key)
+    if version is None:
+        if cache.add(key, _initial_version(), None):
+            cache.set(modified_key, int(time.time()), None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_version(key, modified_key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), None)
+    cache.set(modified_key, int(time.time()), None)
+
+
+def _get_modified(modified_key):
+    modified = cache.get(modified_key)
+    if modified is None:
+        # Время изменения потеряно (вытеснено) — считаем, что изменилось сейчас
+        modified = int(time.time())
+        cache.add(modified_key, modified, None)
+    return modified
+
+
+def get_venue_version(venue_id):
+    return _get_version(VERSION_KEY.format(venue_id), MODIFIED_KEY.format(venue_id))
+
+
+def get_venue_modified(venue_id):
+    """Unix-время последнего изменения площадки (для Last-Modified)."""
+    return _get_modified(MODIFIED_KEY.format(venue_id))
+
+
+def bump_venue_version(venue_id):
+    _bump_version(VERSION_KEY.format(venue_id), MODIFIED_KEY.format(venue_id))
+
+
+def invalidate_venue(venue_id):
+    """Сбрасывает кэш площадки после фиксации текущей транзакции."""
+    transaction.on_commit(lambda: bump_venue_version(venue_id))
+
+
+def get_catalog_version():
+    return _get_version(CATALOG_VERSION_KEY, CATALOG_MODIFIED_KEY)
+
+
+def get_catalog_modified():
+    return _get_modified(CATALOG_MODIFIED_KEY)
+
+
+def invalidate_catalog():
+    """Сбрасывает версию каталога (карта площадок) после фиксации транзакции."""
+    transaction.on_commit(lambda: _bump_version(CATALOG_VERSION_KEY, CATALOG_MODIFIED_KEY))
+
+
+def get_reference_version():
+    return _get_version(REFERENCE_VERSION_KEY, REFERENCE_MODIFIED_KEY)
+
+
+def get_reference_modified():
+    return _get_modified(REFERENCE_MODIFIED_KEY)
+
+
+def invalidate_reference():
+    """Сбрасывает версию справочников (регионы, типы площадок) после фиксации транзакции."""
+    transaction.on_commit(lambda: _bump_version(REFERENCE_VERSION_KEY, REFERENCE_MODIFIED_KEY))
+
+
+def get_favorites_version(user_id):
+    return _get_version(FAVORITES_VERSION_KEY.format(user_id), FAVORITES_MODIFIED_KEY.format(user_id))
+
+
+def get_favorites_modified(user_id):
+    return _get_modified(FAVORITES_MODIFIED_KEY.format(user_id))
+
+
+def invalidate_favorites(user_id):
+    """Сбрасывает версию избранного пользователя (is_favorite в карточке) после фиксации транзакции."""
+    transaction.on_commit(lambda: _bump_version(
+        FAVORITES_VERSION_KEY.format(user_id), FAVORITES_MODIFIED_KEY.format(user_id)
+    ))
+
+
+def make_etag(*parts):
+    """Сильный ETag из версий и нормализованных параметров запроса."""
+    return '"%s"' % hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+def _count(name):
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    hits = cache.get(STATS_KEY.format("hits"), 0)
+    misses = cache.get(STATS_KEY.format("misses"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def _slot_start(now):
+    return now.replace(minute=now.minute - now.minute % MIN_SLOT_MINUTES, second=0, microsecond=0)
+
+
+def _is_time_dependent(date_from):
+    """
+    Прошедшие слоты недоступны, поэтому ответ, в который попадает сегодня
+    (или завтра — это ещё «сегодня» у клиента в западной таймзоне), зависит от времени.
+    date_from — первая дата ответа: период с неё включает сегодня или завтра.
+    """
+    return date_from <= timezone.localdate() + timedelta(days=1)
+
+
+def _timeout_for(date_from):
+    """
+    Ответ на сегодня зависит от текущего времени (прошедшие слоты недоступны),
+    поэтому живёт только до границы ближайшего слота (самый мелкий шаг — 15 минут).
+    """
+    if not _is_time_dependent(date_from):
+        return AVAILABILITY_TIMEOUT
+    now = timezone.localtime()
+    next_slot = _slot_start(now) + timedelta(minutes=MIN_SLOT_MINUTES)
+    return max(1, int((next_slot - now).total_seconds()))
+
+
+def availability_validators(venue_id, params, date_from):
+    """
+    ETag и Last-Modified ответа доступности.
+    Если период с date_from включает сегодня, в них входит начало текущего
+    15-минутного слота — по его смене прошедшие слоты уходят из ответа.
+    """
+    version = get_venue_version(venue_id)
+    modified = get_venue_modified(venue_id)
+    bucket = ""
+    if _is_time_dependent(date_from):
+        bucket = int(_slot_start(timezone.localtime()).timestamp())
+        modified = max(modified, bucket)
+    return make_etag("availability", venue_id, version, params, bucket), modified
+
+
+def get_or_build_availability(venue_id, params, date_from, build):
+    """
+    Возвращает ответ доступности из кэша или строит его через build().
+    params — нормализованные параметры запроса (даты, таймзона),
+    date_from — первая дата ответа (определяет время жизни записи).
+    """
+    key = AVAILABILITY_KEY.format(venue_id, get_venue_version(venue_id), params)
+    data = cache.get(key)
+    if data is not None:
+        _count("hits")
+        return data
+
+    _count("misses")
+    data = build()
+    cache.set(key, data, _timeout_for(date_from))
+    return data
@@ -0,0 +1,116 @@
+"""
+Счётчики для панели фильтров (регионы, типы, удобства, диапазоны цен).
+
+Все счётчики считаются одним запросом: GROUP BY (регион, тип) с условными
+COUNT по удобствам и ценовым диапазонам; свёртка групп — в Python.
+Результат кэшируется по нормализованным параметрам фильтра и версии каталога.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .cache import get_catalog_version
+from .models import AMENITIES
+
+
+# Диапазоны цены за час: [from, to)
+PRICE_BUCKETS = (
+    (None, 100000),
+    (100000, 200000),
+    (200000, 300000),
+    (300000, None),
+)
+
+FACETS_KEY = "venues:facets:v{}:{}"
+# Каталог меняется редко, а смена версии и так делает старые записи недостижимыми
+FACETS_TIMEOUT = 60 * 60
+# Счётчики со свободным окном зависят от броней, а не только от каталога
+FACETS_BOOKINGS_TIMEOUT = 60
+BOOKING_PARAMS = ("free_from", "free_to")
+
+
+def _bucket_key(low, high):
+    return f"{low or 0}-{high or ''}"
+
+
+def _bucket_filter(low, high):
+    condition = Q()
+    if low is not None:
+        condition &= Q(price_per_hour__gte=low)
+    if high is not None:
+        condition &= Q(price_per_hour__lt=high)
+    return condition
+
+
+def compute_facets(queryset):
+    aggregates = {"total": Count("id")}
+    for name in AMENITIES:
+        aggregates[f"amenity_{name}"] = Count("id", filter=Q(**{f"has_{name}": True}))
+    for index, (low, high) in enumerate(PRICE_BUCKETS):
+        aggregates[f"price_{index}"] = Count("id", filter=_bucket_filter(low, high))
+
+    groups = (
+        queryset.order_by()
+        .values("region_id", "region__name", "sport_venue_type_id", "sport_venue_type__name")
+        .annotate(**aggregates)
+    )
+
+    total = 0
+    regions = {}
+    types = {}
+    amenities = dict.fromkeys(AMENITIES, 0)
+    prices = [0] * len(PRICE_BUCKETS)
+    for group in groups:
+        total += group["total"]
+        region = regions.setdefault(
+            group["region_id"], {"id": group["region_id"], "name": group["region__name"], "count": 0}
+        )
+        region["count"] += group["total"]
+        venue_type = types.setdefault(
+            group["sport_venue_type_id"],
+            {"id": group["sport_venue_type_id"], "name": group["sport_venue_type__name"], "count": 0},
+        )
+        venue_type["count"] += group["total"]
+        for name in AMENITIES:
+            amenities[name] += group[f"amenity_{name}"]
+        for index in range(len(PRICE_BUCKETS)):
+            prices[index] += group[f"price_{index}"]
+
+    def by_count(items):
+        return sorted(items, key=lambda item: (-item["count"], item["id"] is None, item["id"] or 0))
+
+    return {
+        "total": total,
+        "regions": by_count(regions.values()),
+        "sport_venue_types": by_count(types.values()),
+        "amenities": amenities,
+        "price": [
+            {"from": low, "to": high, "key": _bucket_key(low, high), "count": count}
+            for (low, high), count in zip(PRICE_BUCKETS, prices)
+        ],
+    }
+
+
+def facets_params(query_params, names):
+    """Нормализованный ключ фильтра: только параметры фильтра, в стабильном порядке."""
+    return "&".join(
+        f"{name}={value}"
+        for name in sorted(names)
+        for value in sorted(query_params.getlist(name))
+        if value != ""
+    )
+
+
+def get_or_build_facets(params, build):
+    """Счётчики из кэша или через build(); params — результат facets_params()."""
+    digest = hashlib.md5(params.encode()).hexdigest()
+    key = FACETS_KEY.format(get_catalog_version(), digest)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    data = build()
+    depends_on_bookings = any(f"{name}=" in params for name in BOOKING_PARAMS)
+    cache.set(key, data, FACETS_BOOKINGS_TIMEOUT if depends_on_bookings else FACETS_TIMEOUT)
+    return data
@@ -1,11 +1,132 @@
 import django_filters
-from .models import SportVenue
+from django.db.models import BooleanField, Exists, OuterRef
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ValidationError
+
+from bookings.models import Booking
+from .availability import VENUE_TZ
+from .models import AMENITIES, SportVenue
+from .search import search_venues
+from .spatial import NEAR_MAX_RADIUS_KM, NEAR_MAX_RESULTS, distance_km_expression, get_index
 
 
 class SportVenueFilter(django_filters.FilterSet):
     min_price = django_filters.NumberFilter(field_name="price_per_hour", lookup_expr="gte")
     max_price = django_filters.NumberFilter(field_name="price_per_hour", lookup_expr="lte")
+    # Свободное окно: обрабатываются вместе в filter_queryset
+    free_from = django_filters.IsoDateTimeFilter(method="filter_free_window", label="Свободно с")
+    free_to = django_filters.IsoDateTimeFilter(method="filter_free_window", label="Свободно до")
+    q = django_filters.CharFilter(method="filter_search", label="Поиск")
+    amenities = django_filters.CharFilter(
+        method="filter_amenities", label="Удобства через запятую: " + ", ".join(AMENITIES)
+    )
+    open_at = django_filters.TimeFilter(method="filter_open_at", label="Открыто в (HH:MM)")
+    # Ближайшие площадки: обрабатываются вместе в filter_queryset
+    near = django_filters.CharFilter(method="filter_near", label="Рядом с (lat,lon)")
+    radius_km = django_filters.NumberFilter(method="filter_near", label="Радиус, км")
 
     class Meta:
         model = SportVenue
-        fields = ["sport_venue_type", "region", "min_price", "max_price"]
\ No newline at end of file
+        fields = [
+            "sport_venue_type", "region", "min_price", "max_price",
+            "free_from", "free_to", "near", "radius_km", "q", "amenities", "open_at",
+        ]
+
+    def filter_search(self, queryset, name, value):
+        return search_venues(queryset, value)
+
+    def filter_amenities(self, queryset, name, value):
+        names = {part.strip() for part in value.split(",") if part.strip()}
+        unknown = names - set(AMENITIES)
+        if unknown:
+            raise ValidationError({"detail": f"Неизвестные удобства: {', '.join(sorted(unknown))}"})
+        mask = 0
+        for bit, amenity in enumerate(AMENITIES):
+            if amenity in names:
+                mask |= 1 << bit
+        if not mask:
+            return queryset
+        # Все маски, содержащие требуемые биты: IN по btree-индексу вместо побитового AND
+        supersets = [m for m in range(1 << len(AMENITIES)) if m & mask == mask]
+        return queryset.filter(amenities__in=supersets)
+
+    def filter_open_at(self, queryset, name, value):
+        return queryset.filter(open_time__lte=value, close_time__gt=value)
+
+    def filter_free_window(self, queryset, name, value):
+        return queryset
+
+    def filter_near(self, queryset, name, value):
+        return queryset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        queryset = self._filter_free_window(queryset)
+        return self._filter_near(queryset)
+
+    def _filter_near(self, queryset):
+        near = self.form.cleaned_data.get("near")
+        radius_km = self.form.cleaned_data.get("radius_km")
+        if not near:
+            if radius_km is not None:
+                raise ValidationError({"detail": "radius_km передаётся вместе с near"})
+            return queryset
+
+        try:
+            lat, lon = (float(part) for part in near.split(","))
+        except ValueError:
+            raise ValidationError({"detail": "Параметр near задаётся как lat,lon"})
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValidationError({"detail": "Координаты near вне допустимого диапазона"})
+        if radius_km is not None and radius_km <= 0:
+            raise ValidationError({"detail": "radius_km должен быть больше нуля"})
+
+        if radius_km is not None:
+            radius_km = min(float(radius_km), NEAR_MAX_RADIUS_KM)
+
+        distance = distance_km_expression(lat, lon)
+        candidates = queryset.filter(latitude__isnull=False, longitude__isnull=False)
+        if radius_km is not None:
+            # Площадки в круге отбирает индекс в памяти; массив — один параметр,
+            # = ANY идёт по первичному ключу
+            ids, _ = get_index().nearest(lat, lon, radius_km, limit=None)
+            candidates = candidates.filter(
+                RawSQL("playgrounds_sportvenue.id = ANY(%s::bigint[])", (ids.tolist(),), output_field=BooleanField())
+            )
+        # Ограничение NEAR_MAX_RESULTS — уже после остальных фильтров (регион, тип, цена, q),
+        # иначе подходящие площадки за пределами общего топа ближайших терялись бы
+        nearest = candidates.annotate(distance_km=distance).order_by("distance_km", "id").values("id")
+        return (
+            queryset.filter(id__in=nearest[:NEAR_MAX_RESULTS])
+            .annotate(distance_km=distance)
+            .order_by("distance_km", "id")
+        )
+
+    def _filter_free_window(self, queryset):
+        free_from = self.form.cleaned_data.get("free_from")
+        free_to = self.form.cleaned_data.get("free_to")
+        if free_from is None and free_to is None:
+            return queryset
+        if free_from is None or free_to is None:
+            raise ValidationError({"detail": "Параметры free_from и free_to передаются вместе"})
+        if free_to <= free_from:
+            raise ValidationError({"detail": "free_to должно быть позже free_from"})
+
+        # Рабочее время площадок задано по Ташкенту
+        local_from = free_from.astimezone(VENUE_TZ)
+        local_to = free_to.astimezone(VENUE_TZ)
+        if local_from.date() != local_to.date():
+            raise ValidationError({"detail": "Окно должно быть в пределах одного дня"})
+
+        # NOT EXISTS: нет активных броней, пересекающих окно
+        overlapping = Booking.objects.filter(
+            stadium=OuterRef("pk"),
+            start_time__lt=free_to,
+            end_time__gt=free_from,
+            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED],
+        )
+        return queryset.filter(
+            ~Exists(overlapping),
+            open_time__lte=local_from.time(),
+            close_time__gte=local_to.time(),
+        )
@@ -0,0 +1,89 @@
+"""
+Видимая область карты и серверная кластеризация площадок.
+
+На мелких зумах площадки группируются по сетке прямо в SQL (GROUP BY
+номера ячейки), поэтому размер ответа и стоимость запроса зависят от
+числа ячеек на экране, а не от размера каталога.
+"""
+from django.db.models import Avg, Count, FloatField, Min, Value
+from django.db.models.functions import Cast, Floor
+
+
+MIN_ZOOM = 0
+MAX_ZOOM = 22
+# Начиная со следующего зума площадки показываются поштучно
+CLUSTER_MAX_ZOOM = 14
+# Ячеек сетки на ширину тайла 256px (~64px на кластер)
+CELLS_PER_TILE = 4
+
+
+def parse_bbox(value):
+    """
+    "min_lon,min_lat,max_lon,max_lat" → кортеж float.
+    ValueError, если строка некорректна.
+    """
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must have 4 numbers")
+    min_lon, min_lat, max_lon, max_lat = parts
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise ValueError("bbox out of range")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def parse_zoom(value):
+    zoom = int(value)
+    if not MIN_ZOOM <= zoom <= MAX_ZOOM:
+        raise ValueError("zoom out of range")
+    return zoom
+
+
+def in_bbox(queryset, bbox):
+    min_lon, min_lat, max_lon, max_lat = bbox
+    return queryset.filter(
+        longitude__gte=min_lon, longitude__lte=max_lon,
+        latitude__gte=min_lat, latitude__lte=max_lat,
+    )
+
+
+def cell_size(zoom):
+    """Размер ячейки сетки в градусах для зума."""
+    return 360 / (2 ** zoom) / CELLS_PER_TILE
+
+
+def cluster(queryset, zoom):
+    """
+    Группирует площадки по ячейкам сетки одним запросом.
+    Возвращает (кластеры из 2+ площадок, id площадок, оказавшихся в ячейке одни).
+    """
+    size = Value(cell_size(zoom))
+    cells = (
+        queryset.filter(latitude__isnull=False, longitude__isnull=False)
+        .annotate(
+            cell_x=Floor(Cast("longitude", FloatField()) / size),
+            cell_y=Floor(Cast("latitude", FloatField()) / size),
+        )
+        .values("cell_x", "cell_y")
+        .annotate(
+            count=Count("id"),
+            center_lat=Avg(Cast("latitude", FloatField())),
+            center_lon=Avg(Cast("longitude", FloatField())),
+            min_price=Min("price_per_hour"),
+            venue_id=Min("id"),
+        )
+        .order_by()
+    )
+
+    clusters = []
+    single_ids = []
+    for cell in cells:
+        if cell["count"] == 1:
+            single_ids.append(cell["venue_id"])
+            continue
+        clusters.append({
+            "latitude": round(cell["center_lat"], 6),
+            "longitude": round(cell["center_lon"], 6),
+            "count": cell["count"],
+            "min_price": cell["min_price"],
+        })
+    return clusters, single_ids
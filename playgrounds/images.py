@@ -0,0 +1,186 @@
+"""
+Уменьшенные копии фотографий площадок.
+
+Для каждого оригинала SportVenueImage.image строятся размеры thumb/card/full
+в WebP и JPEG (для клиентов без WebP). Файлы лежат рядом с оригиналами
+в sport_venue_images/variants/, их имена — в SportVenueImage.variants:
+
+    {"source": "<имя оригинала>",
+     "files": {"thumb": {"webp": "...", "jpeg": "..."}, "card": {...}, "full": {...}}}
+
+source позволяет понять, что оригинал заменён и копии нужно пересобрать.
+
+Там же считаются размеры оригинала, преобладающий цвет и крошечное
+превью (LQIP, data-URI) — клиент рисует карточку сразу, до загрузки фото.
+"""
+import base64
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = "sport_venue_images/variants"
+# Размер по длинной стороне; меньшие оригиналы не увеличиваются
+VARIANT_SIZES = {
+    "thumb": 320,
+    "card": 800,
+    "full": 1600,
+}
+VARIANT_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+FORMAT_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+# Превью-заглушка: длинная сторона в пикселях (клиент растягивает её с размытием)
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def open_image(source):
+    """Открывает оригинал с учётом EXIF-поворота и приводит к RGB."""
+    image = Image.open(source)
+    image = ImageOps.exif_transpose(image)
+    if image.mode != "RGB":
+        # Прозрачность заливаем белым, а не чёрным
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    image.load()
+    return image
+
+
+def render_variants(image):
+    """{размер: {формат: bytes}} для открытого изображения."""
+    rendered = {}
+    for size, max_side in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        rendered[size] = {}
+        for fmt, (pil_format, options) in VARIANT_FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, **options)
+            rendered[size][fmt] = buffer.getvalue()
+    return rendered
+
+
+def variant_name(source_name, size, fmt):
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    return f"{VARIANTS_DIR}/{stem}-{size}.{FORMAT_EXTENSIONS[fmt]}"
+
+
+def save_variants(storage, source_name, rendered):
+    """Сохраняет копии в хранилище и возвращает значение для SportVenueImage.variants."""
+    files = {}
+    for size, formats in rendered.items():
+        files[size] = {
+            fmt: storage.save(variant_name(source_name, size, fmt), ContentFile(data))
+            for fmt, data in formats.items()
+        }
+    return {"source": source_name, "files": files}
+
+
+def variant_files(variants):
+    return {name for formats in (variants or {}).get("files", {}).values() for name in formats.values()}
+
+
+def delete_variants(storage, variants, keep=None):
+    """
+    Удаляет файлы копий. keep(name) -> True — файл ещё нужен: при хранении
+    по хэшу содержимого одинаковые фото делят одни и те же копии.
+    """
+    for name in variant_files(variants):
+        if keep is None or not keep(name):
+            storage.delete(name)
+
+
+def dominant_color(image):
+    """Преобладающий цвет в виде #rrggbb."""
+    small = image.copy()
+    small.thumbnail((64, 64))
+    palette_image = small.quantize(colors=4)
+    _, index = max(palette_image.getcolors())
+    r, g, b = palette_image.getpalette()[index * 3:index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def placeholder(image):
+    """Крошечный WebP в data-URI (обычно 100–300 байт)."""
+    tiny = image.copy()
+    tiny.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    tiny.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def image_metadata(image):
+    return {
+        "width": image.width,
+        "height": image.height,
+        "dominant_color": dominant_color(image),
+        "placeholder": placeholder(image),
+    }
+
+
+def render_image(source):
+    """
+    Вся работа Pillow для одного фото: {"rendered": копии в байтах, "width": ..., ...}.
+    source — путь или файловый объект. Не трогает БД и хранилище,
+    поэтому годится для пула процессов (см. uploads.py).
+    """
+    image = open_image(source)
+    return {"rendered": render_variants(image), **image_metadata(image)}
+
+
+def store_image_data(storage, source_name, result, previous=None, keep=None):
+    """
+    Сохраняет копии из render_image() и возвращает значения полей SportVenueImage
+    ({"variants": ..., "width": ..., ...}). Старые копии (previous) удаляются,
+    кроме совпавших с новыми и тех, для которых keep(name) -> True.
+    """
+    data = dict(result)
+    rendered = data.pop("rendered")
+    variants = save_variants(storage, source_name, rendered)
+    current = variant_files(variants)
+    delete_variants(storage, previous, keep=lambda name: name in current or (keep is not None and keep(name)))
+    return {"variants": variants, **data}
+
+
+def build_image_data(field_file, previous=None, keep=None):
+    """Копии и метаданные для файла ImageField в текущем процессе."""
+    with field_file.open("rb") as f:
+        result = render_image(f)
+    return store_image_data(field_file.storage, field_file.name, result, previous, keep)
+
+
+IMAGE_META_FIELDS = ("width", "height", "dominant_color", "placeholder")
+
+
+def image_meta(data):
+    """Размеры, цвет и превью для сериализаторов; None, если фото ещё не обработано."""
+    if not data or data.get("width") is None:
+        return None
+    return {field: data[field] for field in IMAGE_META_FIELDS}
+
+
+def is_current(variants, source_name):
+    return bool(variants) and variants.get("source") == source_name
+
+
+def variant_urls(variants, source_name, url, sizes=None):
+    """
+    {размер: {формат: адрес}} для сериализаторов; пусто, если копий ещё нет
+    (клиент тогда берёт оригинал). url(name) превращает имя файла в адрес.
+    """
+    if not is_current(variants, source_name):
+        return {}
+    return {
+        size: {fmt: url(name) for fmt, name in formats.items()}
+        for size, formats in variants["files"].items()
+        if sizes is None or size in sizes
+    }
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+
+from playgrounds.cache import invalidate_catalog, invalidate_venue
+from playgrounds.models import SportVenueImage
+from playgrounds.snapshot import schedule_map_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Строит уменьшенные копии (WebP/JPEG) и метаданные (размеры, цвет, превью) для фотографий, у которых их нет'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересобрать копии для всех фотографий',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Показать количество фотографий для обработки, без выполнения',
+        )
+
+    def handle(self, *args, **options):
+        pending = [
+            image for image in SportVenueImage.objects.order_by('id').iterator()
+            if image.image and (options['force'] or image.needs_processing())
+        ]
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'Найдено {len(pending)} фотографий для обработки (dry-run)'))
+            return
+
+        failed = 0
+        venue_ids = set()
+        for image in pending:
+            if image.process_image():
+                venue_ids.add(image.sport_venue_id)
+            else:
+                failed += 1
+
+        # Результат сохраняется через update() без сигналов — сбрасываем кэши сами
+        for venue_id in venue_ids:
+            invalidate_venue(venue_id)
+        if venue_ids:
+            invalidate_catalog()
+            schedule_map_snapshot()
+
+        self.stdout.write(self.style.SUCCESS(f'Обработано фотографий: {len(pending) - failed}'))
+        if failed:
+            self.stdout.write(self.style.ERROR(f'Не удалось обработать: {failed} (см. лог)'))
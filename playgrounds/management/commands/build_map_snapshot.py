@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from playgrounds.snapshot import build_map_snapshot, snapshot_url
+
+
+class Command(BaseCommand):
+    help = 'Собирает снимок карты площадок (JSON + .gz/.br) в MEDIA_ROOT/snapshots'
+
+    def handle(self, *args, **options):
+        version = build_map_snapshot()
+        self.stdout.write(self.style.SUCCESS(f'Снимок карты {version}: {snapshot_url(version)}'))
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoProject.storage import ContentAddressedStorage
+from playgrounds.cache import invalidate_catalog, invalidate_venue
+from playgrounds.models import SportVenueImage
+from playgrounds.snapshot import schedule_map_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Переименовывает загруженные ранее медиафайлы (фото площадок, их копии, аватары) по хэшу содержимого'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Показать количество файлов для переименования, без выполнения',
+        )
+        parser.add_argument(
+            '--delete-old',
+            action='store_true',
+            help='Удалить файлы со старыми именами после переноса',
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('STORAGES["default"] должен быть djangoProject.storage.ContentAddressedStorage')
+
+        images = [
+            image for image in SportVenueImage.objects.order_by('id').iterator()
+            if self._pending_names(image.image.name, image.variants)
+        ]
+        users = [
+            user for user in get_user_model().objects.exclude(photo='').exclude(photo__isnull=True).order_by('id')
+            if not default_storage.is_hashed(user.photo.name)
+        ]
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(
+                f'Найдено фотографий площадок: {len(images)}, аватаров: {len(users)} (dry-run)'
+            ))
+            return
+
+        self.old_names = set()
+        self.missing = 0
+        venue_ids = set()
+        for image in images:
+            name = self._rehash(image.image.name)
+            variants = image.variants
+            if variants.get('files'):
+                variants = {
+                    **variants,
+                    'files': {
+                        size: {fmt: self._rehash(file_name) for fmt, file_name in formats.items()}
+                        for size, formats in variants['files'].items()
+                    },
+                }
+            if variants.get('source') == image.image.name:
+                # Копии остаются актуальными для переименованного оригинала
+                variants['source'] = name
+            SportVenueImage.objects.filter(pk=image.pk).update(image=name, variants=variants)
+            venue_ids.add(image.sport_venue_id)
+
+        for user in users:
+            get_user_model().objects.filter(pk=user.pk).update(photo=self._rehash(user.photo.name))
+
+        # update() без сигналов — сбрасываем кэши сами
+        for venue_id in venue_ids:
+            invalidate_venue(venue_id)
+        if venue_ids:
+            invalidate_catalog()
+            schedule_map_snapshot()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Переименовано фотографий площадок: {len(images)}, аватаров: {len(users)}'
+        ))
+        if self.missing:
+            self.stdout.write(self.style.ERROR(f'Файлов не найдено на диске: {self.missing} (имена не изменены)'))
+
+        if options['delete_old']:
+            for name in self.old_names:
+                default_storage.delete(name)
+            self.stdout.write(self.style.SUCCESS(f'Удалено старых файлов: {len(self.old_names)}'))
+        elif self.old_names:
+            self.stdout.write(self.style.WARNING(
+                f'Старые файлы оставлены ({len(self.old_names)}), удалить: --delete-old'
+            ))
+
+    @staticmethod
+    def _pending_names(name, variants):
+        names = [name] + [
+            file_name for formats in (variants or {}).get('files', {}).values() for file_name in formats.values()
+        ]
+        return [file_name for file_name in names if file_name and not default_storage.is_hashed(file_name)]
+
+    def _rehash(self, name):
+        """Новое имя файла по содержимому; старое — если файл уже переименован или пропал."""
+        if default_storage.is_hashed(name):
+            return name
+        if not default_storage.exists(name):
+            self.missing += 1
+            return name
+        with default_storage.open(name, 'rb') as f:
+            new_name = default_storage.save(name, f)
+        self.old_names.add(name)
+        return new_name
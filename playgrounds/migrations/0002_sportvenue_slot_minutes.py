@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sportvenue',
+            name='slot_minutes',
+            field=models.PositiveSmallIntegerField(choices=[(15, '15 минут'), (30, '30 минут'), (60, '60 минут')], default=60, verbose_name='Шаг бронирования (мин)'),
+        ),
+    ]
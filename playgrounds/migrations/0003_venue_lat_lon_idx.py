@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0002_sportvenue_slot_minutes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sportvenue',
+            index=models.Index(fields=['latitude', 'longitude'], name='venue_lat_lon_idx'),
+        ),
+    ]
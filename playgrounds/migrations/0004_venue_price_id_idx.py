@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0003_venue_lat_lon_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sportvenue',
+            index=models.Index(fields=['price_per_hour', 'id'], name='venue_price_id_idx'),
+        ),
+    ]
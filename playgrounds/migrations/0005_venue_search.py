@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:43
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+from unidecode import unidecode
+
+
+def fill_search_translit(apps, schema_editor):
+    SportVenue = apps.get_model('playgrounds', 'SportVenue')
+    for venue in SportVenue.objects.only('id', 'name', 'address', 'description').iterator():
+        translit = unidecode(" ".join(part for part in (venue.name, venue.address, venue.description) if part))
+        SportVenue.objects.filter(pk=venue.pk).update(search_translit=translit)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0004_venue_price_id_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sportvenue',
+            name='search_translit',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(fill_search_translit, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='sportvenue',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='simple', weight='A'), '||', django.contrib.postgres.search.SearchVector('address', 'search_translit', config='simple', weight='B'), django.contrib.postgres.search.SearchConfig('simple')), '||', django.contrib.postgres.search.SearchVector('description', config='simple', weight='C'), django.contrib.postgres.search.SearchConfig('simple')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='sportvenue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='venue_search_gin'),
+        ),
+    ]
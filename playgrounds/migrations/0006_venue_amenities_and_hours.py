@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:44
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0005_venue_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sportvenue',
+            name='amenities',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.Value(0), '+', models.Case(models.When(has_lights=True, then=models.Value(1)), default=models.Value(0))), '+', models.Case(models.When(has_lockers=True, then=models.Value(2)), default=models.Value(0))), '+', models.Case(models.When(has_showers=True, then=models.Value(4)), default=models.Value(0))), '+', models.Case(models.When(has_restrooms=True, then=models.Value(8)), default=models.Value(0))), '+', models.Case(models.When(has_walls=True, then=models.Value(16)), default=models.Value(0))), '+', models.Case(models.When(has_parking=True, then=models.Value(32)), default=models.Value(0))), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='sportvenue',
+            index=models.Index(fields=['amenities'], name='venue_amenities_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sportvenue',
+            index=models.Index(fields=['open_time', 'close_time'], name='venue_hours_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0006_venue_amenities_and_hours'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sportvenueimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Копии'),
+        ),
+    ]
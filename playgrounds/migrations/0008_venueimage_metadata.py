@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('playgrounds', '0007_venueimage_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sportvenueimage',
+            name='dominant_color',
+            field=models.CharField(blank=True, default='', editable=False, max_length=7, verbose_name='Преобладающий цвет'),
+        ),
+        migrations.AddField(
+            model_name='sportvenueimage',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Высота'),
+        ),
+        migrations.AddField(
+            model_name='sportvenueimage',
+            name='placeholder',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Превью-заглушка'),
+        ),
+        migrations.AddField(
+            model_name='sportvenueimage',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ширина'),
+        ),
+    ]
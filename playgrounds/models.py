@@ -1,7 +1,19 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+import logging
+
+from django.db import models, transaction
+from django.db.models import Case, OuterRef, Q, Subquery, TextField, Value, When
+from django.db.models.functions import Cast, JSONObject
 from django.utils.text import slugify
 from unidecode import unidecode
 
+from .images import IMAGE_META_FIELDS, build_image_data, is_current
+from .search import SEARCH_CONFIG, build_search_translit
+from .slots import DEFAULT_SLOT_MINUTES, SLOT_MINUTES_CHOICES
+
+
+logger = logging.getLogger(__name__)
 
 
 class Region(models.Model):
@@ -72,6 +84,10 @@ class SportVenueType(models.Model):
 
 
 
+# Удобства площадки в порядке битов маски SportVenue.amenities
+AMENITIES = ('lights', 'lockers', 'showers', 'restrooms', 'walls', 'parking')
+
+
 class SportVenue(models.Model):
     name = models.CharField(max_length=200, verbose_name='Название')
     description = models.TextField(verbose_name='Описание')
@@ -112,6 +128,11 @@ class SportVenue(models.Model):
     # Время работы
     open_time = models.TimeField(verbose_name="Время открытия", default="08:00")
     close_time = models.TimeField(verbose_name="Время закрытия", default="23:00")
+    slot_minutes = models.PositiveSmallIntegerField(
+        choices=[(minutes, f"{minutes} минут") for minutes in SLOT_MINUTES_CHOICES],
+        default=DEFAULT_SLOT_MINUTES,
+        verbose_name="Шаг бронирования (мин)"
+    )
 
     # Удобства
     has_lights = models.BooleanField(default=False, verbose_name="Освещение")
@@ -120,6 +141,18 @@ class SportVenue(models.Model):
     has_restrooms = models.BooleanField(default=False, verbose_name="Туалеты")
     has_walls = models.BooleanField(default=False, verbose_name="Ограждение/стены")
     has_parking = models.BooleanField(default=False, verbose_name="Парковка")
+    # Битовая маска удобств (бит i — AMENITIES[i]) для индексного фильтра по сочетаниям
+    amenities = models.GeneratedField(
+        expression=sum(
+            (
+                Case(When(**{f'has_{name}': True}, then=Value(1 << bit)), default=Value(0))
+                for bit, name in enumerate(AMENITIES)
+            ),
+            Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
 
     # Гео
     latitude = models.DecimalField(max_digits=9, decimal_places=6, null=True, blank=True, verbose_name='Широта')
@@ -130,9 +163,32 @@ class SportVenue(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Полнотекстовый поиск (playgrounds/search.py): транслитерация заполняется в save(),
+    # вектор считает PostgreSQL
+    search_translit = models.TextField(blank=True, default='', editable=False)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG) +
+            SearchVector('address', 'search_translit', weight='B', config=SEARCH_CONFIG) +
+            SearchVector('description', weight='C', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         verbose_name = 'Спортивная площадка'
         verbose_name_plural = 'Спортивные площадки'
+        indexes = [
+            # Выборка площадок в видимой области карты
+            models.Index(fields=['latitude', 'longitude'], name='venue_lat_lon_idx'),
+            # Курсорная пагинация списка по цене
+            models.Index(fields=['price_per_hour', 'id'], name='venue_price_id_idx'),
+            GinIndex(fields=['search_vector'], name='venue_search_gin'),
+            # Фильтры по удобствам (amenities IN (...)) и «открыто в HH:MM»
+            models.Index(fields=['amenities'], name='venue_amenities_idx'),
+            models.Index(fields=['open_time', 'close_time'], name='venue_hours_idx'),
+        ]
         ordering = ['-created_at']
 
     def __str__(self):
@@ -141,12 +197,24 @@ class SportVenue(models.Model):
     def save(self, *args, **kwargs):
         # if not self.deposit_amount:
         #     self.deposit_amount = self.price_per_hour
+        self.search_translit = build_search_translit(self.name, self.address, self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'search_translit'}
         super().save(*args, **kwargs)
 
 
 class SportVenueImage(models.Model):
     sport_venue = models.ForeignKey(SportVenue, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='sport_venue_images/', verbose_name='Фотография')
+    # Уменьшенные копии WebP/JPEG (см. images.py)
+    variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Копии')
+    # Метаданные оригинала для отрисовки карточки до загрузки фото
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='Ширина')
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False, verbose_name='Высота')
+    dominant_color = models.CharField(max_length=7, blank=True, default='', editable=False,
+                                      verbose_name='Преобладающий цвет')
+    placeholder = models.TextField(blank=True, default='', editable=False, verbose_name='Превью-заглушка')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -156,6 +224,61 @@ class SportVenueImage(models.Model):
     def __str__(self):
         return f"Фото {self.sport_venue.name}"
 
+    def save(self, *args, process=True, **kwargs):
+        """process=False — сохранить только оригинал (обработка в фоне, см. uploads.py)."""
+        # Одна транзакция: сброс кэшей и снимок карты (on_commit) увидят готовые копии
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if process and self.image and self.needs_processing():
+                self.process_image()
+
+    def variant_url(self, size, fmt="jpeg"):
+        """Адрес копии нужного размера; оригинал, если копий ещё нет."""
+        if is_current(self.variants, self.image.name):
+            return self.image.storage.url(self.variants["files"][size][fmt])
+        return self.image.url
+
+    def needs_processing(self):
+        return not is_current(self.variants, self.image.name) or self.width is None
+
+    def process_image(self):
+        """Строит копии и метаданные оригинала; при ошибке фото остаётся без них (отдаётся оригинал)."""
+        try:
+            data = build_image_data(self.image, previous=self.variants, keep=self.file_in_use)
+        except Exception as exc:
+            logger.error("Не удалось обработать фото %s: %s", self.image.name, exc, exc_info=True)
+            return False
+        self.apply_image_data(data)
+        return True
+
+    def file_in_use(self, name):
+        """Файл нужен другой фотографии (одинаковые загрузки хранятся одним файлом)."""
+        return (
+            SportVenueImage.objects.exclude(pk=self.pk)
+            .annotate(variants_text=Cast('variants', TextField()))
+            .filter(Q(image=name) | Q(variants_text__contains=f'"{name}"'))
+            .exists()
+        )
+
+    def apply_image_data(self, data):
+        """Записывает результат store_image_data() без повторного save() и сигналов."""
+        for field, value in data.items():
+            setattr(self, field, value)
+        SportVenueImage.objects.filter(pk=self.pk).update(**data)
+
+
+def first_image_subquery():
+    """
+    Первое фото площадки (по OuterRef('pk')) одним подзапросом —
+    JSON-объект с путём оригинала, копиями и метаданными.
+    """
+    return Subquery(
+        SportVenueImage.objects.filter(sport_venue=OuterRef('pk')).order_by('id').values(
+            data=JSONObject(name='image', variants='variants', **{field: field for field in IMAGE_META_FIELDS})
+        )[:1],
+        output_field=models.JSONField(),
+    )
+
 
 class FavoriteSportVenue(models.Model):
     user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='favorite_sport_venues')
@@ -0,0 +1,147 @@
+"""
+Pub/sub для живых обновлений слотов (SSE).
+
+Издатель — пересчёт занятости площадки (после фиксации транзакции),
+подписчики — открытые SSE-соединения. LocalBroker доставляет сообщения
+внутри процесса; при нескольких воркерах нужен RedisBroker, который
+пересылает публикации всем процессам через Redis PUBLISH/PSUBSCRIBE.
+
+Бэкенд задаётся настройкой LIVE_UPDATES = {"BACKEND": ..., "OPTIONS": {...}}.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "venue:{}:slots"
+# Сообщения сверх лимита для медленного клиента отбрасываются:
+# SSE-поток всё равно пересчитывает состояние дня целиком
+QUEUE_SIZE = 100
+
+
+def _put(queue, message):
+    try:
+        queue.put_nowait(message)
+    except asyncio.QueueFull:
+        pass
+
+
+class LocalBroker:
+    """Подписчики в том же процессе (разработка, один воркер)."""
+
+    def __init__(self, **options):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self._deliver(channel, message)
+
+    def _deliver(self, channel, message):
+        # publish вызывается из потоков синхронных view — кладём в очередь через цикл подписчика
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put, queue, message)
+            except RuntimeError:
+                # Цикл подписчика уже закрыт
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(QUEUE_SIZE))
+        with self._lock:
+            self._subscribers[channel].add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(entry)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+
+class RedisBroker(LocalBroker):
+    """Рассылка между процессами через Redis (нужен пакет redis)."""
+
+    def __init__(self, url, **options):
+        super().__init__(**options)
+        self.url = url
+        self._client = None
+        self._listeners = {}
+
+    def publish(self, channel, message):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, json.dumps(message))
+
+    async def _listen(self):
+        import redis.asyncio as aioredis
+
+        while True:
+            try:
+                client = aioredis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(CHANNEL.format("*"))
+                    async for item in pubsub.listen():
+                        if item["type"] == "pmessage":
+                            self._deliver(item["channel"].decode(), json.loads(item["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("Live updates: соединение с Redis потеряно: %s", exc)
+                await asyncio.sleep(1)
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        # Один слушатель Redis на цикл событий процесса
+        loop = asyncio.get_running_loop()
+        if loop not in self._listeners or self._listeners[loop].done():
+            self._listeners[loop] = loop.create_task(self._listen())
+        async with super().subscribe(channel) as queue:
+            yield queue
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, "LIVE_UPDATES", {})
+                backend = import_string(config.get("BACKEND", "playgrounds.pubsub.LocalBroker"))
+                _broker = backend(**config.get("OPTIONS", {}))
+    return _broker
+
+
+def publish_slots_changed(venue_id, dates=None):
+    """
+    Сообщает подписчикам площадки, что слоты изменились (после фиксации транзакции).
+    dates — затронутые даты, None — все (например, изменились часы работы).
+    """
+    message = {
+        "venue_id": venue_id,
+        "dates": [date.isoformat() for date in dates] if dates is not None else None,
+    }
+
+    def publish():
+        try:
+            get_broker().publish(CHANNEL.format(venue_id), message)
+        except Exception as exc:
+            # Живые обновления не должны ломать бронирование
+            logger.error("Live updates: не удалось опубликовать изменение площадки %s: %s", venue_id, exc)
+
+    transaction.on_commit(publish)
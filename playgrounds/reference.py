@@ -0,0 +1,81 @@
+"""
+Справочные данные для клиента: регионы, типы площадок, футбольные справочники.
+
+Хранятся одним блоком по версии справочников и языку: в памяти процесса
+и в общем кэше (для остальных воркеров). Правка региона или типа
+увеличивает версию (см. signals.py), и следующий запрос собирает блок заново.
+
+ETag раздела — хэш его содержимого, поэтому он не меняется, пока
+не изменились сами данные (в том числе между перезапусками).
+"""
+import hashlib
+import json
+import threading
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.translation import get_language
+
+from accounts.serializers import get_football_choices
+from .cache import get_reference_modified, get_reference_version, make_etag
+from .models import Region, SportVenueType
+from .serializers import RegionSerializer, SportVenueTypeSerializer
+
+
+REFERENCE_KEY = "reference:v{}:{}"
+# Записи живут до смены версии, таймаут лишь ограничивает память
+REFERENCE_TIMEOUT = 60 * 60 * 24
+# Справочники меняются редко: клиенты и nginx могут не перепроверять их час
+REFERENCE_MAX_AGE = 60 * 60
+
+# (версия, язык) -> {"data": ..., "digests": ...}
+_local = {}
+_local_lock = threading.Lock()
+
+
+def _build_reference():
+    return {
+        "regions": RegionSerializer(Region.objects.all(), many=True).data,
+        "sport_venue_types": SportVenueTypeSerializer(SportVenueType.objects.all(), many=True).data,
+        "football_choices": get_football_choices(),
+    }
+
+
+def _digest(value):
+    payload = json.dumps(value, cls=DjangoJSONEncoder, sort_keys=True, ensure_ascii=False)
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+def _get_entry():
+    version = get_reference_version()
+    key = (version, get_language())
+    entry = _local.get(key)
+    if entry is not None:
+        return entry
+
+    data = cache.get(REFERENCE_KEY.format(*key))
+    if data is None:
+        data = _build_reference()
+        cache.set(REFERENCE_KEY.format(*key), data, REFERENCE_TIMEOUT)
+    entry = {"data": data, "digests": {name: _digest(value) for name, value in data.items()}}
+    with _local_lock:
+        # Блоки прежних версий больше не прочитаются
+        for stale in [k for k in _local if k[0] != version]:
+            del _local[stale]
+        _local[key] = entry
+    return entry
+
+
+def get_reference_data():
+    """Справочники текущей версии на языке запроса."""
+    return _get_entry()["data"]
+
+
+def reference_validators(section, *parts):
+    """
+    ETag и Last-Modified раздела справочников.
+    parts — то, что ещё влияет на ответ (страница, хост для ссылок пагинации).
+    """
+    entry = _get_entry()
+    return make_etag("reference", section, entry["digests"][section], *parts), get_reference_modified()
+
@@ -0,0 +1,68 @@
+"""
+Полнотекстовый поиск площадок.
+
+SportVenue.search_vector — хранимый tsvector (generated column) по названию,
+адресу, описанию и их транслитерации (search_translit, заполняется в save()
+через unidecode). Запрос тоже транслитерируется, поэтому «Чиланзар» и
+«Chilanzar» находят одни и те же площадки независимо от алфавита.
+"""
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from unidecode import unidecode
+
+
+SEARCH_CONFIG = "simple"
+# Слов запроса сверх этого числа не учитываем
+MAX_QUERY_WORDS = 8
+
+
+def build_search_translit(*parts):
+    """Латинская транслитерация текстов площадки для поиска."""
+    return unidecode(" ".join(part for part in parts if part))
+
+
+def _words(text):
+    return re.findall(r"\w+", text.lower())[:MAX_QUERY_WORDS]
+
+
+def _prefix_query(words):
+    # Только \w-символы — спецсимволы tsquery в запрос не попадут
+    return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config=SEARCH_CONFIG)
+
+
+def build_search_query(text):
+    """
+    Префиксный tsquery по словам запроса и по их транслитерации.
+    None, если в запросе нет слов.
+    """
+    words = _words(text)
+    if not words:
+        return None
+    query = _prefix_query(words)
+    translit = _words(unidecode(" ".join(words)))
+    if translit and translit != words:
+        query |= _prefix_query(translit)
+    return query
+
+
+def search_venues(queryset, text):
+    """Фильтрует и сортирует площадки по релевантности; подсветка — в SQL."""
+    query = build_search_query(text)
+    if query is None:
+        return queryset
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            # ts_rank возвращает real; в double precision значение из курсора
+            # сравнивается с рангом в SQL точно, без дублей между страницами
+            search_rank=Cast(SearchRank(F("search_vector"), query), FloatField()),
+            headline=SearchHeadline(
+                "name", query, config=SEARCH_CONFIG, highlight_all=True,
+                start_sel="<b>", stop_sel="</b>",
+            ),
+        )
+        .order_by("-search_rank", "id")
+    )
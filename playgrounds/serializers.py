@@ -1,4 +1,7 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from .images import image_meta, variant_urls
 from .models import SportVenue, SportVenueType, Region, SportVenueImage, FavoriteSportVenue
 from django.contrib.auth import get_user_model
 
@@ -6,10 +9,26 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+def media_url_builder(context):
+    """Имя файла в хранилище -> адрес (абсолютный, если в контексте есть request)."""
+    request = context.get('request')
+
+    def build(name):
+        url = default_storage.url(name)
+        return request.build_absolute_uri(url) if request else url
+    return build
+
+
 class SportVenueImageSerializer(serializers.ModelSerializer):
+    # {"thumb"|"card"|"full": {"webp": url, "jpeg": url}}; пусто, пока копии не готовы
+    variants = serializers.SerializerMethodField()
+
     class Meta:
         model = SportVenueImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'variants', 'width', 'height', 'dominant_color', 'placeholder']
+
+    def get_variants(self, obj):
+        return variant_urls(obj.variants, obj.image.name, media_url_builder(self.context))
 
 
 class SportVenueTypeSerializer(serializers.ModelSerializer):
@@ -35,15 +54,71 @@ class SportVenueSerializer(serializers.ModelSerializer):
     sport_venue_type = SportVenueTypeSerializer(read_only=True)
     region = RegionSerializer(read_only=True)
     images = SportVenueImageSerializer(many=True, read_only=True)
+    distance_km = serializers.SerializerMethodField()
+    # Аннотация Exists для авторизованного пользователя (см. ClientSportVenueViewSet)
+    is_favorite = serializers.BooleanField(default=False, read_only=True)
 
     class Meta:
         model = SportVenue
         fields = [
             'id', 'name', 'description', 'price_per_hour',
             'address', 'latitude', 'longitude', 'yandex_map_url',
-            'sport_venue_type', 'region', 'open_time', 'close_time', 'owner', 'images'
+            'sport_venue_type', 'region', 'open_time', 'close_time', 'slot_minutes', 'owner', 'images',
+            'distance_km', 'is_favorite'
         ]
 
+    def get_distance_km(self, obj):
+        # Есть только при поиске ближайших (?near=lat,lon)
+        distance = getattr(obj, 'distance_km', None)
+        return round(distance, 2) if distance is not None else None
+
+
+class SportVenueListSerializer(serializers.Serializer):
+    """
+    Облегчённая площадка для списка: строится из словарей values()
+    (см. ClientSportVenueViewSet.list), без вложенных владельца, региона и фото.
+    """
+    # Колонки values(), из которых строится представление
+    VALUES = (
+        'id', 'name', 'price_per_hour', 'region_id', 'sport_venue_type_id',
+        'latitude', 'longitude', 'first_image',
+    )
+
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    price_per_hour = serializers.DecimalField(max_digits=10, decimal_places=2)
+    region = serializers.IntegerField(source='region_id', allow_null=True)
+    sport_venue_type = serializers.IntegerField(source='sport_venue_type_id', allow_null=True)
+    latitude = serializers.DecimalField(max_digits=9, decimal_places=6, allow_null=True)
+    longitude = serializers.DecimalField(max_digits=9, decimal_places=6, allow_null=True)
+    image = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    # Размеры, цвет и превью первого фото — для отрисовки до загрузки
+    image_meta = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
+    # Название с подсветкой совпадений (<b>…</b>), только при поиске ?q=
+    headline = serializers.CharField(default=None, read_only=True)
+    is_favorite = serializers.BooleanField(default=False, read_only=True)
+
+    def get_image(self, obj):
+        # first_image — JSON-объект из first_image_subquery()
+        if not obj['first_image']:
+            return None
+        url = settings.MEDIA_URL + obj['first_image']['name']
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_image_variants(self, obj):
+        image = obj['first_image'] or {}
+        return variant_urls(image.get('variants'), image.get('name'), media_url_builder(self.context))
+
+    def get_image_meta(self, obj):
+        return image_meta(obj['first_image'])
+
+    def get_distance_km(self, obj):
+        distance = obj.get('distance_km')
+        return round(distance, 2) if distance is not None else None
+
 
 class FavoriteSportVenueSerializer(serializers.ModelSerializer):
     sport_venue = SportVenueSerializer(read_only=True)
@@ -56,3 +131,21 @@ class FavoriteSportVenueSerializer(serializers.ModelSerializer):
     class Meta:
         model = FavoriteSportVenue
         fields = ['id', 'sport_venue', 'sport_venue_id', 'created_at']
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Площадка из избранного — в избранном по определению
+        data['sport_venue']['is_favorite'] = True
+        return data
+
+
+class FavoriteBulkSerializer(serializers.Serializer):
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), max_length=100, required=False, default=list)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), max_length=100, required=False, default=list)
+
+    def validate_add(self, value):
+        existing = set(SportVenue.objects.filter(id__in=value).values_list('id', flat=True))
+        missing = sorted(set(value) - existing)
+        if missing:
+            raise serializers.ValidationError(f"Площадки не найдены: {', '.join(map(str, missing))}")
+        return value
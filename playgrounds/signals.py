@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_catalog, invalidate_favorites, invalidate_reference, invalidate_venue
+from .models import FavoriteSportVenue, Region, SportVenue, SportVenueImage, SportVenueType
+from .pubsub import publish_slots_changed
+from .snapshot import schedule_map_snapshot
+
+
+@receiver([post_save, post_delete], sender=SportVenue)
+def venue_changed(sender, instance, **kwargs):
+    # Рабочие часы влияют на доступность
+    invalidate_venue(instance.pk)
+    invalidate_catalog()
+    publish_slots_changed(instance.pk)
+    schedule_map_snapshot()
+
+
+@receiver([post_save, post_delete], sender=SportVenueImage)
+def venue_image_changed(sender, instance, **kwargs):
+    # Фото входят в карточку площадки и карту
+    invalidate_venue(instance.sport_venue_id)
+    invalidate_catalog()
+    schedule_map_snapshot()
+
+
+@receiver([post_save, post_delete], sender=Region)
+@receiver([post_save, post_delete], sender=SportVenueType)
+def reference_changed(sender, instance, **kwargs):
+    # Названия региона и типа выводятся в карточке площадки и в справочниках
+    invalidate_catalog()
+    invalidate_reference()
+
+
+@receiver([post_save, post_delete], sender=FavoriteSportVenue)
+def favorite_changed(sender, instance, **kwargs):
+    # Флаг is_favorite входит в карточку площадки для этого пользователя
+    invalidate_favorites(instance.user_id)
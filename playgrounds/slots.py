@@ -0,0 +1,126 @@
+"""
+Движок временных слотов площадки.
+
+Всё время внутри движка — минуты от локальной полуночи (по Ташкенту),
+интервалы полуоткрытые: [start, end). Занятость передаётся списком
+интервалов, которые сливаются за один проход; разметка слотов дня
+строится за O(слотов + интервалов).
+"""
+from datetime import datetime, time
+
+# Допустимый шаг слотов площадки (минуты)
+SLOT_MINUTES_CHOICES = (15, 30, 60)
+DEFAULT_SLOT_MINUTES = 60
+# Самый мелкий шаг — точность хранения занятости
+MIN_SLOT_MINUTES = min(SLOT_MINUTES_CHOICES)
+
+MIN_BOOKING_MINUTES = 60
+DAY_MINUTES = 24 * 60
+
+
+def minutes_of(value):
+    """Минуты от полуночи для time/datetime."""
+    return value.hour * 60 + value.minute
+
+
+def minutes_since(day_start, moment):
+    """Минуты от начала дня до moment (может быть < 0 или > суток)."""
+    return int((moment - day_start).total_seconds() // 60)
+
+
+def merge_intervals(intervals):
+    """
+    Сливает пересекающиеся и смежные интервалы.
+    Уже отсортированный вход (брони из БД по start_time) обрабатывается за линейное время.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def mask_to_intervals(mask, slot_minutes=MIN_SLOT_MINUTES):
+    """Битовая маска занятости (бит i — слот i) → слитые интервалы в минутах."""
+    intervals = []
+    index = 0
+    while mask:
+        if mask & 1:
+            start = index
+            while mask & 1:
+                mask >>= 1
+                index += 1
+            intervals.append((start * slot_minutes, index * slot_minutes))
+        else:
+            # Пропускаем серию нулей целиком
+            zeros = (mask & -mask).bit_length() - 1
+            mask >>= zeros
+            index += zeros
+    return intervals
+
+
+def busy_slots(open_min, close_min, step, busy):
+    """
+    Для каждого слота [p, p + step) от открытия до закрытия — занят ли он.
+    Всё, что после закрытия, считается занятым. busy — слитые интервалы.
+    """
+    flags = []
+    i = 0
+    point = open_min
+    while point < close_min:
+        slot_end = min(point + step, close_min)
+        while i < len(busy) and busy[i][1] <= point:
+            i += 1
+        flags.append(
+            point + step > close_min or (i < len(busy) and busy[i][0] < slot_end)
+        )
+        point += step
+    return flags
+
+
+def build_points(open_min, close_min, step, busy, now_min=None):
+    """
+    Временные точки дня: [(минута, доступна), ...], включая точку закрытия.
+
+    Точка доступна, если:
+      - она не в прошлом (now_min — текущая минута дня, None — день в будущем);
+      - слот [p, p + step) свободен и целиком до закрытия;
+      - она не зажата между занятыми слотами (одиночный свободный слот).
+    Точка закрытия — только окончание брони, для неё проверяется лишь время.
+    """
+    flags = busy_slots(open_min, close_min, step, busy)
+    points = []
+    for index, is_busy in enumerate(flags):
+        point = open_min + index * step
+        available = not is_busy
+        if now_min is not None and point <= now_min:
+            available = False
+        if (
+            available and
+            index > 0 and flags[index - 1] and
+            index + 1 < len(flags) and flags[index + 1]
+        ):
+            available = False
+        points.append((point, available))
+
+    points.append((close_min, now_min is None or close_min > now_min))
+    return points
+
+
+def has_free_slot(points):
+    """Есть ли хотя бы одна точка, с которой можно начать бронь (кроме закрытия)."""
+    return any(available for _, available in points[:-1])
+
+
+def is_on_grid(minute, open_min, close_min, step):
+    """Лежит ли минута на сетке слотов площадки (или совпадает с закрытием)."""
+    return minute == close_min or (minute >= open_min and (minute - open_min) % step == 0)
+
+
+def point_to_datetime(tz, date, minute):
+    return tz.localize(datetime.combine(date, time(minute // 60, minute % 60)))
@@ -0,0 +1,176 @@
+"""
+Готовый снимок карты площадок: компактный JSON плюс заранее сжатые
+.gz (и .br, если установлен brotli) в MEDIA_ROOT/snapshots/.
+
+Имя файла содержит хэш содержимого, поэтому файлы неизменяемы и отдаются
+nginx с долгим кэшированием. Снимок пересобирается после фиксации
+изменений SportVenue/SportVenueImage; актуальная версия хранится в кэше
+и на диске (map-latest.txt).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .cache import get_catalog_version
+from .images import image_meta, variant_urls
+from .models import SportVenue, first_image_subquery
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = "snapshots"
+SNAPSHOT_NAME = "map-{}.json"
+LATEST_NAME = "map-latest.txt"
+SNAPSHOT_KEY = "map:snapshot"
+# Пока один процесс пересобирает снимок, остальные отдают предыдущий
+REBUILD_LOCK_KEY = "map:snapshot:rebuilding"
+REBUILD_LOCK_TIMEOUT = 60
+# Сколько предыдущих снимков оставлять для клиентов со старой ссылкой
+KEEP_SNAPSHOTS = 3
+MAP_VARIANT_SIZES = ("thumb",)
+
+
+def map_venues(queryset):
+    """Площадки для карты: одним запросом, с первым фото (путь относительно MEDIA_URL)."""
+    # Берем первое изображение каждого стадиона
+    venues = queryset.annotate(first_image=first_image_subquery()).values(
+        "id", "name", "price_per_hour", "latitude", "longitude", "first_image"
+    )
+    results = []
+    for v in venues:
+        image = v["first_image"] or {}
+        results.append({
+            "id": v["id"],
+            "name": v["name"],
+            "price_per_hour": v["price_per_hour"],
+            "latitude": v["latitude"],
+            "longitude": v["longitude"],
+            "image": settings.MEDIA_URL + image["name"] if image else None,
+            # Для маркеров карты достаточно миниатюры
+            "image_variants": variant_urls(
+                image.get("variants"), image.get("name"), default_storage.url, sizes=MAP_VARIANT_SIZES
+            ),
+            "image_meta": image_meta(image),
+        })
+    return results
+
+
+def _snapshot_dir():
+    return Path(settings.MEDIA_ROOT) / SNAPSHOT_DIR
+
+
+def _write_atomic(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _cleanup(directory, keep):
+    snapshots = sorted(directory.glob(SNAPSHOT_NAME.format("*")), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in snapshots[keep:]:
+        for suffix in ("", ".gz", ".br"):
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def build_map_snapshot():
+    """
+    Собирает снимок карты и возвращает его версию (хэш содержимого).
+    Если содержимое не изменилось, файлы не перезаписываются.
+    """
+    catalog_version = get_catalog_version()
+    payload = json.dumps(
+        {"venues": map_venues(SportVenue.objects.order_by("id"))},
+        cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":"),
+    ).encode()
+    version = hashlib.sha256(payload).hexdigest()[:16]
+
+    directory = _snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / SNAPSHOT_NAME.format(version)
+    if not path.exists():
+        _write_atomic(path.with_name(path.name + ".gz"), gzip.compress(payload, 9, mtime=0))
+        if brotli is not None:
+            _write_atomic(path.with_name(path.name + ".br"), brotli.compress(payload))
+        # Основной файл пишем последним: его наличие означает готовый снимок
+        _write_atomic(path, payload)
+    else:
+        os.utime(path)
+
+    _write_atomic(directory / LATEST_NAME, version.encode())
+    cache.set(SNAPSHOT_KEY, {"version": version, "catalog_version": catalog_version}, None)
+    _cleanup(directory, KEEP_SNAPSHOTS)
+    logger.info("Map snapshot %s built (%s bytes)", version, len(payload))
+    return version
+
+
+def get_map_snapshot_version():
+    """Версия актуального снимка; при отсутствии или устаревании — пересобирает."""
+    state = cache.get(SNAPSHOT_KEY)
+    if state is not None and state["catalog_version"] == get_catalog_version():
+        return state["version"]
+
+    if state is None:
+        # Кэш сброшен (перезапуск) — снимок на диске всё ещё актуален, если каталог не менялся
+        try:
+            version = (_snapshot_dir() / LATEST_NAME).read_text().strip()
+        except OSError:
+            version = None
+        if version and (_snapshot_dir() / SNAPSHOT_NAME.format(version)).exists():
+            cache.set(SNAPSHOT_KEY, {"version": version, "catalog_version": get_catalog_version()}, None)
+            return version
+
+    if state is not None and not cache.add(REBUILD_LOCK_KEY, 1, REBUILD_LOCK_TIMEOUT):
+        # Снимок уже пересобирает другой запрос; прежний файл остаётся на диске
+        return state["version"]
+    try:
+        return build_map_snapshot()
+    finally:
+        cache.delete(REBUILD_LOCK_KEY)
+
+
+def snapshot_url(version):
+    return f"{settings.MEDIA_URL}{SNAPSHOT_DIR}/{SNAPSHOT_NAME.format(version)}"
+
+
+def _rebuild_after_commit():
+    state = cache.get(SNAPSHOT_KEY)
+    if state is not None and state["catalog_version"] == get_catalog_version():
+        return
+    try:
+        build_map_snapshot()
+    except Exception as exc:
+        # Снимок пересоберётся при следующем запросе
+        logger.error("Не удалось собрать снимок карты: %s", exc, exc_info=True)
+
+
+def schedule_map_snapshot():
+    """
+    Пересобирает снимок после фиксации текущей транзакции — один раз на
+    транзакцию, сколько бы площадок и фото в ней ни сохранили.
+    """
+    connection = transaction.get_connection()
+    if any(callback is _rebuild_after_commit for _, callback, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_rebuild_after_commit)
@@ -0,0 +1,146 @@
+"""
+Поиск ближайших площадок без PostGIS.
+
+Координаты всех площадок держатся в памяти процесса в массивах NumPy,
+отсортированных по ячейке сетки CELL_DEGREES × CELL_DEGREES. Запрос с
+радиусом выбирает кандидатов из нужных ячеек через searchsorted (каждая
+строка сетки — непрерывный отрезок массива) и считает haversine сразу по
+всему отрезку. Индекс перестраивается, когда меняется версия каталога.
+"""
+import math
+import threading
+
+import numpy as np
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+from .cache import get_catalog_version
+from .models import SportVenue
+
+
+EARTH_RADIUS_KM = 6371.0088
+CELL_DEGREES = 0.1
+# Ближайших площадок в ответе не больше стольких (и с радиусом, и без)
+NEAR_MAX_RESULTS = 500
+# Больший радиус обрезается: запрос не должен охватывать весь каталог
+NEAR_MAX_RADIUS_KM = 100
+
+_LON_CELLS = int(360 / CELL_DEGREES) + 1
+_LAT_OFFSET = int(90 / CELL_DEGREES)
+_LON_OFFSET = int(180 / CELL_DEGREES)
+
+
+def _cell_rows(lat):
+    return np.floor(np.asarray(lat) / CELL_DEGREES).astype(np.int64) + _LAT_OFFSET
+
+
+def _cell_cols(lon):
+    return np.floor(np.asarray(lon) / CELL_DEGREES).astype(np.int64) + _LON_OFFSET
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Расстояние от точки до массива точек (градусы) в километрах."""
+    lat, lon = math.radians(lat), math.radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = (
+        np.sin((lats - lat) / 2) ** 2 +
+        math.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distance_km_expression(lat, lon):
+    """
+    Та же формула haversine в SQL: расстояние от точки до площадки в километрах.
+    Считается только для отобранных индексом строк, без передачи расстояний в запрос.
+    """
+    venue_lat = Radians(Cast(F("latitude"), FloatField()))
+    venue_lon = Radians(Cast(F("longitude"), FloatField()))
+    lat, lon = math.radians(lat), math.radians(lon)
+    a = (
+        Power(Sin((venue_lat - Value(lat)) / 2), 2) +
+        Value(math.cos(lat)) * Cos(venue_lat) * Power(Sin((venue_lon - Value(lon)) / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, Value(1.0))))
+
+
+class VenueIndex:
+    def __init__(self, ids, lats, lons):
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        keys = _cell_rows(lats) * _LON_CELLS + _cell_cols(lons)
+        order = np.argsort(keys, kind="stable")
+        self.ids = np.asarray(ids, dtype=np.int64)[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+        self.keys = keys[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _candidates(self, lat, lon, radius_km):
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        cos_lat = math.cos(math.radians(lat))
+        # У полюсов долгота вырождается — берём всю строку сетки
+        dlon = 180.0 if cos_lat < 1e-6 else min(180.0, dlat / cos_lat)
+
+        first_row, last_row = _cell_rows([max(-90.0, lat - dlat), min(90.0, lat + dlat)])
+        first_col, last_col = _cell_cols([max(-180.0, lon - dlon), min(180.0, lon + dlon)])
+        rows = np.arange(first_row, last_row + 1) * _LON_CELLS
+        starts = np.searchsorted(self.keys, rows + first_col, side="left")
+        ends = np.searchsorted(self.keys, rows + last_col, side="right")
+        if not len(starts):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+
+    def nearest(self, lat, lon, radius_km=None, limit=NEAR_MAX_RESULTS):
+        """
+        Ближайшие площадки: (ids, distances_km), по возрастанию расстояния.
+        С радиусом — площадки в круге, без него — из всего индекса;
+        в обоих случаях не больше limit ближайших (None — без ограничения).
+        """
+        if radius_km is None:
+            candidates = np.arange(len(self.ids))
+        else:
+            candidates = self._candidates(lat, lon, radius_km)
+
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        if radius_km is not None:
+            inside = distances <= radius_km
+            candidates, distances = candidates[inside], distances[inside]
+
+        if limit is not None and len(distances) > limit:
+            part = np.argpartition(distances, limit)[:limit]
+            candidates, distances = candidates[part], distances[part]
+
+        order = np.lexsort((self.ids[candidates], distances))
+        return self.ids[candidates][order], distances[order]
+
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def build_index():
+    rows = SportVenue.objects.filter(
+        latitude__isnull=False, longitude__isnull=False
+    ).values_list("id", "latitude", "longitude")
+    ids, lats, lons = [], [], []
+    for venue_id, lat, lon in rows:
+        ids.append(venue_id)
+        lats.append(float(lat))
+        lons.append(float(lon))
+    return VenueIndex(ids, lats, lons)
+
+
+def get_index():
+    """Индекс процесса; перестраивается при смене версии каталога."""
+    global _index, _index_version
+    version = get_catalog_version()
+    if _index is None or _index_version != version:
+        with _lock:
+            if _index is None or _index_version != version:
+                _index = build_index()
+                _index_version = version
+    return _index
@@ -0,0 +1,44 @@
+import pytest
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from playgrounds.models import SportVenue
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="testuser", password="pass123", telegram_id="123456789")
+
+
+@pytest.fixture
+def venue(db):
+    return SportVenue.objects.create(
+        name="Test Stadium",
+        description="Тестовая площадка",
+        price_per_hour=Decimal("100000.00"),
+        open_time="08:00",
+        close_time="23:00",
+    )
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Снимки карты и файлы фото не должны попадать в media/ проекта
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
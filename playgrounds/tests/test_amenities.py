@@ -0,0 +1,40 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import SportVenue
+
+
+def _venue(name, **kwargs):
+    return SportVenue.objects.create(name=name, description="", price_per_hour=Decimal("1"), **kwargs)
+
+
+@pytest.mark.django_db
+def test_amenities_mask_is_kept_in_sync():
+    venue = _venue("A", has_lights=True, has_parking=True)
+    venue.refresh_from_db()
+    assert venue.amenities == 0b100001
+
+    SportVenue.objects.filter(pk=venue.pk).update(has_lights=False)
+    venue.refresh_from_db()
+    assert venue.amenities == 0b100000
+
+
+@pytest.mark.django_db
+def test_filter_by_amenity_combination(api_client):
+    full = _venue("Full", has_lights=True, has_showers=True, has_parking=True, has_lockers=True)
+    _venue("No showers", has_lights=True, has_parking=True)
+
+    resp = api_client.get("/api/sport-venues/", {"amenities": "lights,showers,parking"})
+    assert resp.status_code == 200
+    assert [v["id"] for v in resp.json()["results"]] == [full.id]
+
+    assert api_client.get("/api/sport-venues/", {"amenities": "pool"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_filter_open_at(api_client):
+    day = _venue("Day", open_time="08:00", close_time="18:00")
+    night = _venue("Night", open_time="18:00", close_time="23:59")
+
+    assert [v["id"] for v in api_client.get("/api/sport-venues/", {"open_at": "18:00"}).json()["results"]] == [night.id]
+    assert [v["id"] for v in api_client.get("/api/sport-venues/", {"open_at": "09:30"}).json()["results"]] == [day.id]
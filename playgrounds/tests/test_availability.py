@@ -0,0 +1,57 @@
+import pytest
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from bookings.models import Booking
+from bookings.occupancy import refresh_booking_occupancy
+from playgrounds.availability import VENUE_TZ
+
+
+def _local(date, hour):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, 0)))
+
+
+@pytest.mark.django_db
+def test_available_range_returns_every_day(api_client, user, venue):
+    date_from = timezone.now().date() + timedelta(days=1)
+    date_to = date_from + timedelta(days=6)
+    booking = Booking.objects.create(user=user, stadium=venue, start_time=_local(date_from, 10),
+                                     end_time=_local(date_from, 12), amount=Decimal("200000.00"))
+    refresh_booking_occupancy(booking)
+
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/available-range/",
+                          {"from": date_from.isoformat(), "to": date_to.isoformat()})
+    assert resp.status_code == 200
+    days = resp.json()["days"]
+    assert [d["date"] for d in days][0] == date_from.isoformat()
+    assert len(days) == 7
+
+    first_day = {p["time"]: p["is_available"] for p in days[0]["time_points"]}
+    assert first_day["10:00"] is False
+    assert first_day["11:00"] is False
+    assert first_day["12:00"] is True
+    assert all(p["is_available"] for p in days[1]["time_points"])
+    assert days[1]["is_fully_booked"] is False
+
+
+@pytest.mark.django_db
+def test_available_range_marks_fully_booked_day(api_client, user, venue):
+    date = timezone.now().date() + timedelta(days=2)
+    booking = Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 8),
+                                     end_time=_local(date, 23), amount=Decimal("1500000.00"),
+                                     status=Booking.STATUS_CONFIRMED)
+    refresh_booking_occupancy(booking)
+
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/available-range/",
+                          {"from": date.isoformat(), "to": date.isoformat()})
+    assert resp.status_code == 200
+    assert resp.json()["days"][0]["is_fully_booked"] is True
+
+
+@pytest.mark.django_db
+def test_available_range_rejects_too_long_period(api_client, venue):
+    date_from = timezone.now().date() + timedelta(days=1)
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/available-range/",
+                          {"from": date_from.isoformat(), "to": (date_from + timedelta(days=60)).isoformat()})
+    assert resp.status_code == 400
@@ -0,0 +1,37 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from bookings.models import Booking
+from playgrounds.models import FavoriteSportVenue, Region
+
+
+@pytest.mark.django_db
+def test_bootstrap_returns_reference_and_user_data(api_client, user, venue):
+    FavoriteSportVenue.objects.create(user=user, sport_venue=venue)
+    start = timezone.now() + timedelta(days=1)
+    booking = Booking.objects.create(user=user, stadium=venue, start_time=start,
+                                     end_time=start + timedelta(hours=1), amount=Decimal("1"))
+    api_client.force_authenticate(user=user)
+
+    data = api_client.get("/api/bootstrap/").json()
+    assert data["user"]["id"] == user.id
+    assert data["favorite_ids"] == [venue.id]
+    assert [b["id"] for b in data["recent_bookings"]] == [booking.id]
+    assert set(data["football_choices"]) == {"experience", "frequency", "position", "format"}
+    assert {"regions", "sport_venue_types"} <= set(data)
+
+
+@pytest.mark.django_db
+def test_bootstrap_reference_cached_until_region_changes(api_client, django_assert_num_queries,
+                                                         django_capture_on_commit_callbacks):
+    api_client.get("/api/bootstrap/")
+    with django_assert_num_queries(0):
+        data = api_client.get("/api/bootstrap/").json()
+    assert data["user"] is None and data["favorite_ids"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        region = Region.objects.create(name="Новый регион")
+    regions = api_client.get("/api/bootstrap/").json()["regions"]
+    assert region.id in [r["id"] for r in regions]
@@ -0,0 +1,58 @@
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from playgrounds.models import SportVenueImage
+from playgrounds.uploads import wait_for_processing
+
+
+def _photo(name, size=(1200, 800)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.fixture
+def admin_client(api_client, db):
+    admin = get_user_model().objects.create_superuser(username="root", password="pass", telegram_id="1")
+    api_client.force_authenticate(user=admin)
+    return api_client
+
+
+def _upload(client, venue, files):
+    return client.post(f"/api/admin-panel/sportvenues/{venue.id}/images/", {"images": files}, format="multipart")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bulk_upload_returns_202_and_processes_in_pool(admin_client, venue, settings):
+    settings.IMAGE_PROCESSING_WORKERS = 1
+
+    resp = _upload(admin_client, venue, [_photo("a.jpg"), _photo("b.jpg")])
+    assert resp.status_code == 202
+    ids = [image["id"] for image in resp.json()]
+    assert len(ids) == 2
+
+    assert wait_for_processing(timeout=60) == 2
+    for photo in SportVenueImage.objects.filter(id__in=ids):
+        assert (photo.width, photo.height) == (1200, 800)
+        assert default_storage.exists(photo.variants["files"]["thumb"]["webp"])
+
+
+@pytest.mark.django_db
+def test_bulk_upload_rejects_broken_files(admin_client, venue, settings, django_capture_on_commit_callbacks):
+    settings.IMAGE_PROCESSING_WORKERS = 0
+
+    assert _upload(admin_client, venue, [_photo("a.gif")]).status_code == 400
+
+    broken = SimpleUploadedFile("broken.jpg", b"not an image", content_type="image/jpeg")
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = _upload(admin_client, venue, [_photo("ok.jpg"), broken])
+    assert resp.status_code == 202
+    # Битый файл удалён при обработке, нормальный — обработан
+    photos = list(SportVenueImage.objects.filter(sport_venue=venue))
+    assert len(photos) == 1
+    assert photos[0].width == 1200
@@ -0,0 +1,69 @@
+import pytest
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+
+from bookings import services
+from bookings.models import Booking
+from playgrounds.availability import VENUE_TZ
+from playgrounds import cache as availability_cache
+from playgrounds.cache import AVAILABILITY_TIMEOUT, get_cache_stats
+from playgrounds.slots import MIN_SLOT_MINUTES
+
+
+def _local(date, hour):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, 0)))
+
+
+@pytest.mark.django_db
+def test_available_time_is_cached_and_invalidated_by_booking(api_client, user, venue,
+                                                             django_capture_on_commit_callbacks):
+    date = timezone.now().date() + timedelta(days=2)
+    url = f"/api/sport-venues/{venue.id}/available-time/"
+    params = {"date": date.isoformat(), "tz": "Asia/Tashkent"}
+
+    first = api_client.get(url, params).json()
+    second = api_client.get(url, params).json()
+    assert first == second
+    assert get_cache_stats()["hits"] == 1
+    assert get_cache_stats()["misses"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        services.create_booking(user=user, stadium=venue, start_time=_local(date, 10),
+                                end_time=_local(date, 11), payment_method=Booking.PAYMENT_CASH)
+
+    points = {p["time"]: p["is_available"] for p in api_client.get(url, params).json()["time_points"]}
+    assert points["10:00"] is False
+    assert get_cache_stats()["misses"] == 2
+
+
+class _RecordingCache:
+    def __init__(self, backend):
+        self._backend = backend
+        self.timeouts = {}
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def set(self, key, value, timeout=None):
+        self.timeouts[key] = timeout
+        return self._backend.set(key, value, timeout)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("offset, short", [(0, True), (3, False)])
+def test_range_starting_today_expires_at_next_slot(api_client, venue, monkeypatch, offset, short):
+    recording = _RecordingCache(availability_cache.cache)
+    monkeypatch.setattr(availability_cache, "cache", recording)
+    date_from = timezone.localdate() + timedelta(days=offset)
+
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/available-range/", {
+        "from": date_from.isoformat(), "to": (date_from + timedelta(days=6)).isoformat(),
+    })
+
+    assert resp.status_code == 200
+    [timeout] = [t for key, t in recording.timeouts.items() if key.startswith("availability:")
+                 and "stats" not in key]
+    if short:
+        assert timeout <= MIN_SLOT_MINUTES * 60
+    else:
+        assert timeout == AVAILABILITY_TIMEOUT
@@ -0,0 +1,77 @@
+import pytest
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+
+from bookings import services
+from bookings.models import Booking
+from playgrounds import cache as availability_cache
+from playgrounds.availability import VENUE_TZ
+
+
+def _local(date, hour):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, 0)))
+
+
+@pytest.mark.django_db
+def test_available_time_returns_304_until_booking_changes(api_client, user, venue,
+                                                          django_capture_on_commit_callbacks,
+                                                          django_assert_num_queries):
+    date = timezone.now().date() + timedelta(days=3)
+    url = f"/api/sport-venues/{venue.id}/available-time/"
+    params = {"date": date.isoformat()}
+
+    first = api_client.get(url, params)
+    assert first.status_code == 200
+    etag = first["ETag"]
+    assert "no-cache" in first["Cache-Control"]
+
+    # Неизменившийся ответ — без единого запроса к БД
+    with django_assert_num_queries(0):
+        second = api_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert second.status_code == 304
+    assert second["ETag"] == etag
+
+    with django_capture_on_commit_callbacks(execute=True):
+        services.create_booking(user=user, stadium=venue, start_time=_local(date, 10),
+                                end_time=_local(date, 11), payment_method=Booking.PAYMENT_CASH)
+
+    third = api_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert third.status_code == 200
+    assert third["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_range_including_today_etag_changes_with_time_slot(api_client, venue, monkeypatch):
+    date_from = timezone.localdate()
+    url = f"/api/sport-venues/{venue.id}/available-range/"
+    params = {"from": date_from.isoformat(), "to": (date_from + timedelta(days=6)).isoformat()}
+
+    etag = api_client.get(url, params)["ETag"]
+    assert api_client.get(url, params, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Начался следующий 15-минутный слот — прошедшие слоты должны уйти из ответа
+    slot_start = availability_cache._slot_start
+    monkeypatch.setattr(availability_cache, "_slot_start", lambda now: slot_start(now) + timedelta(minutes=15))
+
+    fresh = api_client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+    assert fresh.status_code == 200
+    assert fresh["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_venue_detail_and_map_are_conditional(api_client, venue, django_capture_on_commit_callbacks):
+    detail_url = f"/api/sport-venues/{venue.id}/"
+    detail = api_client.get(detail_url)
+    assert detail.status_code == 200
+    assert api_client.get(detail_url, HTTP_IF_NONE_MATCH=detail["ETag"]).status_code == 304
+
+    map_url = "/api/sport-venues/map/"
+    venues_map = api_client.get(map_url)
+    assert api_client.get(map_url, HTTP_IF_NONE_MATCH=venues_map["ETag"]).status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        venue.name = "Renamed"
+        venue.save()
+
+    assert api_client.get(detail_url, HTTP_IF_NONE_MATCH=detail["ETag"]).status_code == 200
+    assert api_client.get(map_url, HTTP_IF_NONE_MATCH=venues_map["ETag"]).status_code == 200
@@ -0,0 +1,61 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import Region, SportVenue, SportVenueType
+
+
+@pytest.fixture
+def catalog(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        tashkent = Region.objects.create(name="Регион A")
+        samarkand = Region.objects.create(name="Регион B")
+        football = SportVenueType.objects.create(name="Тип A")
+        SportVenue.objects.create(name="A", description="", price_per_hour=Decimal("80000"),
+                                  region=tashkent, sport_venue_type=football, has_lights=True)
+        SportVenue.objects.create(name="B", description="", price_per_hour=Decimal("150000"),
+                                  region=tashkent, sport_venue_type=football, has_lights=True, has_parking=True)
+        SportVenue.objects.create(name="C", description="", price_per_hour=Decimal("350000"),
+                                  region=samarkand, has_parking=True)
+    return tashkent, samarkand, football
+
+
+@pytest.mark.django_db
+def test_facets_count_filtered_venues_in_one_query(api_client, catalog, django_assert_num_queries):
+    tashkent, samarkand, football = catalog
+
+    with django_assert_num_queries(1):
+        resp = api_client.get("/api/sport-venues/facets/")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 3
+    assert data["regions"] == [
+        {"id": tashkent.id, "name": "Регион A", "count": 2},
+        {"id": samarkand.id, "name": "Регион B", "count": 1},
+    ]
+    assert data["sport_venue_types"] == [
+        {"id": football.id, "name": "Тип A", "count": 2},
+        {"id": None, "name": None, "count": 1},
+    ]
+    assert data["amenities"]["lights"] == 2
+    assert data["amenities"]["parking"] == 2
+    assert [bucket["count"] for bucket in data["price"]] == [1, 1, 0, 1]
+
+    filtered = api_client.get("/api/sport-venues/facets/", {"amenities": "parking"}).json()
+    assert filtered["total"] == 2
+    assert filtered["amenities"]["lights"] == 1
+
+
+@pytest.mark.django_db
+def test_facets_cached_until_catalog_changes(api_client, catalog, django_assert_num_queries,
+                                             django_capture_on_commit_callbacks):
+    api_client.get("/api/sport-venues/facets/", {"max_price": "200000", "open_at": "10:00"})
+    with django_assert_num_queries(0):
+        # Тот же фильтр в другом порядке параметров — тот же ключ
+        resp = api_client.get("/api/sport-venues/facets/?open_at=10:00&max_price=200000&page=2")
+    assert resp.json()["total"] == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        SportVenue.objects.create(name="D", description="", price_per_hour=Decimal("90000"))
+    assert api_client.get("/api/sport-venues/facets/", {"max_price": "200000", "open_at": "10:00"}).json()["total"] == 3
+
+    assert api_client.get("/api/sport-venues/facets/", {"amenities": "pool"}).status_code == 400
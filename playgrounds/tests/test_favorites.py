@@ -0,0 +1,59 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import FavoriteSportVenue, SportVenue
+
+
+@pytest.fixture
+def other_venue(db):
+    return SportVenue.objects.create(name="Other", description="", price_per_hour=Decimal("1"))
+
+
+@pytest.mark.django_db
+def test_bulk_add_remove_and_ids(api_client, user, venue, other_venue):
+    api_client.force_authenticate(user=user)
+    FavoriteSportVenue.objects.create(user=user, sport_venue=other_venue)
+
+    resp = api_client.post("/api/favorites/bulk/", {"add": [venue.id, other_venue.id], "remove": []}, format="json")
+    assert resp.status_code == 200
+    assert sorted(resp.json()["ids"]) == sorted([venue.id, other_venue.id])
+
+    resp = api_client.post("/api/favorites/bulk/", {"remove": [other_venue.id]}, format="json")
+    assert resp.json()["ids"] == [venue.id]
+    assert api_client.get("/api/favorites/ids/").json() == {"ids": [venue.id]}
+
+    resp = api_client.post("/api/favorites/bulk/", {"add": [999999]}, format="json")
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_is_favorite_on_list_and_detail(api_client, user, venue, other_venue, django_capture_on_commit_callbacks):
+    assert api_client.get("/api/sport-venues/").json()["results"][0]["is_favorite"] is False
+
+    api_client.force_authenticate(user=user)
+    detail = api_client.get(f"/api/sport-venues/{venue.id}/")
+    assert detail.json()["is_favorite"] is False
+    assert "Authorization" in detail["Vary"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FavoriteSportVenue.objects.create(user=user, sport_venue=venue)
+
+    flags = {v["id"]: v["is_favorite"] for v in api_client.get("/api/sport-venues/").json()["results"]}
+    assert flags == {venue.id: True, other_venue.id: False}
+    # Избранное изменилось — старый ETag карточки не подходит
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/", HTTP_IF_NONE_MATCH=detail["ETag"])
+    assert resp.status_code == 200
+    assert resp.json()["is_favorite"] is True
+
+
+@pytest.mark.django_db
+def test_favorites_list_query_count_does_not_grow(api_client, user, django_assert_max_num_queries):
+    for i in range(5):
+        venue = SportVenue.objects.create(name=f"V{i}", description="", price_per_hour=Decimal("1"), owner=user)
+        FavoriteSportVenue.objects.create(user=user, sport_venue=venue)
+    api_client.force_authenticate(user=user)
+
+    with django_assert_max_num_queries(3):
+        resp = api_client.get("/api/favorites/")
+    assert len(resp.json()["results"]) == 5
+    assert all(f["sport_venue"]["is_favorite"] for f in resp.json()["results"])
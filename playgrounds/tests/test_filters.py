@@ -0,0 +1,41 @@
+import pytest
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from bookings.models import Booking
+from playgrounds.availability import VENUE_TZ
+from playgrounds.models import SportVenue
+
+
+def _local(date, hour):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, 0)))
+
+
+@pytest.mark.django_db
+def test_free_window_excludes_booked_and_closed_venues(api_client, user, venue):
+    date = timezone.now().date() + timedelta(days=3)
+    busy = SportVenue.objects.create(name="Busy", description="", price_per_hour=Decimal("1"))
+    closed = SportVenue.objects.create(name="Closed", description="", price_per_hour=Decimal("1"),
+                                       open_time="08:00", close_time="20:00")
+    Booking.objects.create(user=user, stadium=busy, start_time=_local(date, 20),
+                           end_time=_local(date, 21), amount=Decimal("1"))
+    # Отменённая бронь окно не занимает
+    Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 19),
+                           end_time=_local(date, 21), amount=Decimal("1"), status=Booking.STATUS_CANCELLED)
+
+    resp = api_client.get("/api/sport-venues/", {
+        "free_from": _local(date, 19).isoformat(),
+        "free_to": _local(date, 21).isoformat(),
+    })
+    assert resp.status_code == 200
+    ids = [v["id"] for v in resp.json()["results"]]
+    assert ids == [venue.id]
+    assert busy.id not in ids and closed.id not in ids
+
+
+@pytest.mark.django_db
+def test_free_window_requires_both_bounds(api_client, venue):
+    date = timezone.now().date() + timedelta(days=3)
+    resp = api_client.get("/api/sport-venues/", {"free_from": _local(date, 19).isoformat()})
+    assert resp.status_code == 400
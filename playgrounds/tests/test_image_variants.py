@@ -0,0 +1,71 @@
+import io
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from playgrounds.models import SportVenueImage
+
+
+def _upload(name="photo.png", size=(2400, 1200), mode="RGBA"):
+    buffer = io.BytesIO()
+    Image.new(mode, size, (10, 120, 40, 255) if mode == "RGBA" else (10, 120, 40)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db
+def test_variants_built_on_save(venue):
+    photo = SportVenueImage.objects.create(sport_venue=venue, image=_upload())
+
+    photo.refresh_from_db()
+    assert photo.variants["source"] == photo.image.name
+    assert set(photo.variants["files"]) == {"thumb", "card", "full"}
+    with default_storage.open(photo.variants["files"]["thumb"]["webp"]) as f:
+        thumb = Image.open(f)
+        assert thumb.format == "WEBP"
+        assert thumb.size == (320, 160)
+    with default_storage.open(photo.variants["files"]["full"]["jpeg"]) as f:
+        assert Image.open(f).size == (1600, 800)
+
+
+@pytest.mark.django_db
+def test_variants_exposed_in_list_detail_and_map(api_client, venue):
+    SportVenueImage.objects.create(sport_venue=venue, image=_upload(mode="RGB"))
+
+    listed = api_client.get("/api/sport-venues/").json()["results"][0]
+    assert listed["image_variants"]["card"]["webp"].startswith("http://testserver/media/")
+
+    detail = api_client.get(f"/api/sport-venues/{venue.id}/").json()
+    assert set(detail["images"][0]["variants"]) == {"thumb", "card", "full"}
+
+    marker = api_client.get("/api/sport-venues/map/").json()["venues"][0]
+    assert set(marker["image_variants"]) == {"thumb"}
+
+
+@pytest.mark.django_db
+def test_backfill_command_builds_missing_variants(venue):
+    photo = SportVenueImage.objects.create(sport_venue=venue, image=_upload())
+    SportVenueImage.objects.filter(pk=photo.pk).update(variants={})
+
+    call_command("build_image_variants")
+
+    photo.refresh_from_db()
+    assert photo.variants["source"] == photo.image.name
+    assert default_storage.exists(photo.variants["files"]["card"]["jpeg"])
+
+
+@pytest.mark.django_db
+def test_metadata_stored_and_exposed(api_client, venue):
+    photo = SportVenueImage.objects.create(sport_venue=venue, image=_upload(size=(900, 600), mode="RGB"))
+
+    photo.refresh_from_db()
+    assert (photo.width, photo.height) == (900, 600)
+    assert photo.dominant_color == "#0a7828"
+    assert photo.placeholder.startswith("data:image/webp;base64,")
+    assert len(photo.placeholder) < 1000
+
+    meta = api_client.get("/api/sport-venues/").json()["results"][0]["image_meta"]
+    assert meta == {"width": 900, "height": 600, "dominant_color": "#0a7828", "placeholder": photo.placeholder}
+    assert api_client.get("/api/sport-venues/map/").json()["venues"][0]["image_meta"] == meta
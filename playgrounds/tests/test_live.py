@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from datetime import datetime, time, timedelta
+from django.test import AsyncClient
+from django.utils import timezone
+
+from bookings import services
+from bookings.models import Booking
+from playgrounds.availability import VENUE_TZ
+from playgrounds.pubsub import LocalBroker
+
+
+def _local(date, hour):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, 0)))
+
+
+def _event(chunk):
+    lines = chunk.decode().strip().splitlines()
+    return lines[0].split(": ", 1)[1], json.loads(lines[1].split(": ", 1)[1])
+
+
+def test_local_broker_delivers_to_channel_subscribers():
+    broker = LocalBroker()
+
+    async def scenario():
+        async with broker.subscribe("venue:1:slots") as queue:
+            broker.publish("venue:2:slots", {"venue_id": 2})
+            broker.publish("venue:1:slots", {"venue_id": 1})
+            return await asyncio.wait_for(queue.get(), 1)
+
+    assert async_to_sync(scenario)() == {"venue_id": 1}
+    assert not broker._subscribers
+
+
+@pytest.mark.django_db
+def test_live_stream_sends_snapshot_then_delta(user, venue, django_capture_on_commit_callbacks):
+    date = timezone.now().date() + timedelta(days=1)
+
+    def book():
+        with django_capture_on_commit_callbacks(execute=True):
+            services.create_booking(user=user, stadium=venue, start_time=_local(date, 10),
+                                    end_time=_local(date, 11), payment_method=Booking.PAYMENT_CASH)
+
+    async def scenario():
+        response = await AsyncClient().get(f"/api/sport-venues/{venue.id}/live/", {"date": date.isoformat()})
+        assert response["Content-Type"] == "text/event-stream"
+        stream = response.streaming_content
+        assert (await anext(stream)).startswith(b"retry:")
+        snapshot = _event(await anext(stream))
+
+        await sync_to_async(book)()
+        delta = _event(await asyncio.wait_for(anext(stream), 5))
+        await stream.aclose()
+        return snapshot, delta
+
+    snapshot, delta = async_to_sync(scenario)()
+    assert snapshot[0] == "snapshot"
+    assert all(p["is_available"] for p in snapshot[1]["time_points"][:-1])
+    assert delta == ("delta", {"date": date.isoformat(),
+                               "time_points": [{"time": "10:00", "is_available": False}]})
+
+
+@pytest.mark.django_db
+def test_live_stream_rejects_bad_date(venue):
+    response = async_to_sync(AsyncClient().get)(f"/api/sport-venues/{venue.id}/live/", {"date": "x"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_live_loads_release_db_connection(venue):
+    from django.db import connection
+    from playgrounds.views import _load_time_points, _reload_venue
+
+    venue.refresh_from_db()
+    date = timezone.now().date() + timedelta(days=1)
+    assert _load_time_points(venue, date, VENUE_TZ)
+    assert connection.connection is None
+
+    assert _reload_venue(venue.pk) == venue
+    assert connection.connection is None
@@ -0,0 +1,45 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import SportVenue
+
+
+def _venue(name, lat, lon, price="100000.00"):
+    return SportVenue.objects.create(name=name, description="", price_per_hour=Decimal(price),
+                                     latitude=Decimal(lat), longitude=Decimal(lon))
+
+
+@pytest.mark.django_db
+def test_map_bbox_limits_venues(api_client):
+    tashkent = _venue("Tashkent", "41.311081", "69.240562")
+    _venue("Samarkand", "39.654167", "66.959722")
+
+    resp = api_client.get("/api/sport-venues/map/", {"bbox": "69.0,41.0,69.5,41.5"})
+    assert resp.status_code == 200
+    assert [v["id"] for v in resp.json()["venues"]] == [tashkent.id]
+    assert "clusters" not in resp.json()
+
+
+@pytest.mark.django_db
+def test_map_clusters_at_low_zoom(api_client):
+    _venue("A", "41.311", "69.240", price="80000.00")
+    _venue("B", "41.312", "69.241", price="50000.00")
+    lonely = _venue("C", "39.654", "66.959")
+
+    resp = api_client.get("/api/sport-venues/map/", {"zoom": 8})
+    assert resp.status_code == 200
+    clusters = resp.json()["clusters"]
+    assert len(clusters) == 1
+    assert clusters[0]["count"] == 2
+    assert Decimal(clusters[0]["min_price"]) == Decimal("50000.00")
+    assert [v["id"] for v in resp.json()["venues"]] == [lonely.id]
+
+    # На крупном зуме — только отдельные площадки
+    resp = api_client.get("/api/sport-venues/map/", {"zoom": 17})
+    assert len(resp.json()["venues"]) == 3
+    assert "clusters" not in resp.json()
+
+
+@pytest.mark.django_db
+def test_map_rejects_bad_bbox(api_client):
+    assert api_client.get("/api/sport-venues/map/", {"bbox": "1,2,3"}).status_code == 400
@@ -0,0 +1,60 @@
+import importlib
+import pytest
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+
+from bookings import services
+from bookings.models import Booking, VenueOccupancy
+from bookings.occupancy import get_occupancy, VENUE_TZ
+from playgrounds.slots import mask_to_intervals
+
+
+def _local(date, hour, minute=0):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, minute)))
+
+
+@pytest.mark.django_db
+def test_create_and_cancel_booking_maintain_occupancy(user, venue):
+    date = timezone.now().date() + timedelta(days=1)
+    booking = services.create_booking(
+        user=user, stadium=venue, start_time=_local(date, 10), end_time=_local(date, 11, 30),
+        payment_method=Booking.PAYMENT_CASH,
+    )
+
+    mask = get_occupancy(venue.id, date, date)[date]
+    assert mask_to_intervals(mask) == [(10 * 60, 11 * 60 + 30)]
+    # 10:00–11:30 — ровно шесть 15-минутных слотов
+    assert bin(mask).count("1") == 6
+
+    booking.cancel_booking()
+    assert not VenueOccupancy.objects.filter(stadium=venue, date=date).exists()
+
+
+@pytest.mark.django_db
+def test_occupancy_migration_backfills_existing_bookings(user, venue):
+    from django.apps import apps
+    migration = importlib.import_module("bookings.migrations.0003_venueoccupancy")
+
+    date = timezone.now().date() + timedelta(days=1)
+    Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 18),
+                           end_time=_local(date, 20), amount=Decimal("1"))
+    Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 8),
+                           end_time=_local(date, 9), amount=Decimal("1"), status=Booking.STATUS_CANCELLED)
+    assert not VenueOccupancy.objects.exists()
+
+    migration.fill_occupancy(apps, None)
+
+    assert mask_to_intervals(get_occupancy(venue.id, date, date)[date]) == [(18 * 60, 20 * 60)]
+
+
+@pytest.mark.django_db
+def test_rebuild_occupancy_command_restores_masks(user, venue):
+    date = timezone.now().date() + timedelta(days=1)
+    Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 18),
+                           end_time=_local(date, 20), amount=Decimal("1"))
+    assert not VenueOccupancy.objects.exists()
+
+    call_command("rebuild_occupancy")
+    assert mask_to_intervals(get_occupancy(venue.id, date, date)[date]) == [(18 * 60, 20 * 60)]
@@ -0,0 +1,38 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import SportVenue
+
+
+@pytest.mark.django_db
+def test_venue_list_cursor_pagination_by_price(api_client, django_assert_num_queries):
+    prices = [300, 100, 200, 100, 500]
+    venues = [SportVenue.objects.create(name=f"V{i}", description="", price_per_hour=Decimal(price))
+              for i, price in enumerate(prices)]
+
+    # Без with_count — без COUNT(*): одна выборка страницы
+    with django_assert_num_queries(1):
+        resp = api_client.get("/api/sport-venues/", {"cursor": "", "ordering": "price_per_hour", "page_size": 2})
+    page = resp.json()
+    assert "count" not in page
+
+    seen = [v["id"] for v in page["results"]]
+    while page["next"]:
+        page = api_client.get(page["next"]).json()
+        seen += [v["id"] for v in page["results"]]
+
+    expected = [v.id for v in sorted(venues, key=lambda v: (v.price_per_hour, v.id))]
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_venue_list_cursor_count_on_demand(api_client):
+    for i in range(3):
+        SportVenue.objects.create(name=f"V{i}", description="", price_per_hour=Decimal("1"))
+
+    resp = api_client.get("/api/sport-venues/", {"pagination": "cursor", "with_count": 1, "page_size": 2})
+    assert resp.json()["count"] == 3
+    assert len(resp.json()["results"]) == 2
+
+    # Обычная постраничная пагинация не изменилась
+    assert api_client.get("/api/sport-venues/", {"page": 2, "page_size": 2}).json()["count"] == 3
@@ -0,0 +1,36 @@
+import pytest
+
+from playgrounds.models import Region
+
+
+@pytest.mark.django_db
+def test_regions_served_from_cache_with_http_caching(api_client, django_assert_num_queries,
+                                                     django_capture_on_commit_callbacks):
+    first = api_client.get("/api/regions/", {"page_size": 100})
+    assert first.status_code == 200
+    assert "public" in first["Cache-Control"] and "max-age=3600" in first["Cache-Control"]
+    assert "Accept-Language" in first["Vary"]
+
+    with django_assert_num_queries(0):
+        again = api_client.get("/api/regions/", {"page_size": 100})
+        not_modified = api_client.get("/api/regions/", {"page_size": 100}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert again.json() == first.json()
+    assert not_modified.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        region = Region.objects.create(name="Новый регион")
+    changed = api_client.get("/api/regions/", {"page_size": 100}, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert region.id in [r["id"] for r in changed.json()["results"]]
+
+
+@pytest.mark.django_db
+def test_football_choices_have_stable_etag(api_client, django_assert_num_queries):
+    choices = api_client.get("/api/auth/football-choices/")
+    position = api_client.get("/api/auth/football-position/")
+    assert position.json() == choices.json()["position"]
+    assert position["ETag"] != choices["ETag"]
+
+    with django_assert_num_queries(0):
+        resp = api_client.get("/api/auth/football-choices/", HTTP_IF_NONE_MATCH=choices["ETag"])
+    assert resp.status_code == 304
@@ -0,0 +1,57 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import SportVenue
+
+
+def _venue(name, address="Адрес не указан", description=""):
+    return SportVenue.objects.create(name=name, address=address, description=description,
+                                     price_per_hour=Decimal("1"))
+
+
+@pytest.mark.django_db
+def test_search_matches_across_alphabets(api_client):
+    cyrillic = _venue("Стадион Чиланзар", address="ул. Бунёдкор, 5")
+    latin = _venue("Chilanzar Arena")
+    _venue("Юнусабад Спорт")
+
+    for q in ("Чиланзар", "chilanzar", "чилан"):
+        resp = api_client.get("/api/sport-venues/", {"q": q})
+        assert resp.status_code == 200
+        assert {v["id"] for v in resp.json()["results"]} == {cyrillic.id, latin.id}, q
+
+
+@pytest.mark.django_db
+def test_search_ranks_name_above_description_and_highlights(api_client):
+    in_description = _venue("Arena", description="Поле рядом с парком Бабур")
+    in_name = _venue("Бабур Футбол")
+
+    results = api_client.get("/api/sport-venues/", {"q": "бабур"}).json()["results"]
+    assert [v["id"] for v in results] == [in_name.id, in_description.id]
+    assert results[0]["headline"] == "<b>Бабур</b> Футбол"
+
+
+@pytest.mark.django_db
+def test_search_ignores_tsquery_syntax(api_client):
+    _venue("Arena")
+    assert api_client.get("/api/sport-venues/", {"q": "&|!:*()"}).status_code == 200
+
+
+@pytest.mark.django_db
+def test_search_with_cursor_pagination(api_client):
+    _venue("Бабур Футбол")
+    _venue("Бабур Арена")
+    _venue("Бабур")
+    _venue("Arena", description="Парк Бабур")
+    _venue("Поле", description="Рядом с Бабур парком")
+    expected = [v["id"] for v in api_client.get("/api/sport-venues/", {"q": "бабур"}).json()["results"]]
+
+    page = api_client.get("/api/sport-venues/", {"q": "бабур", "cursor": "", "page_size": 2})
+    assert page.status_code == 200
+    page = page.json()
+    seen = [v["id"] for v in page["results"]]
+    while page["next"]:
+        page = api_client.get(page["next"]).json()
+        seen += [v["id"] for v in page["results"]]
+
+    assert seen == expected
@@ -0,0 +1,81 @@
+import pytest
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from django.utils import timezone
+
+from bookings.models import Booking
+from bookings.occupancy import refresh_booking_occupancy
+from bookings.serializers import BookingCreateSerializer
+from playgrounds.availability import VENUE_TZ
+from playgrounds.slots import build_points, mask_to_intervals, merge_intervals
+
+
+def _local(date, hour, minute=0):
+    return VENUE_TZ.localize(datetime.combine(date, time(hour, minute)))
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent():
+    assert merge_intervals([(600, 660), (540, 600), (700, 720), (710, 715)]) == [(540, 660), (700, 720)]
+
+
+def test_mask_to_intervals():
+    # слоты 40–45 (10:00–11:30) и 72 (18:00–18:15)
+    mask = (((1 << 6) - 1) << 40) | (1 << 72)
+    assert mask_to_intervals(mask) == [(600, 690), (1080, 1095)]
+
+
+def test_build_points_half_hour_step():
+    # 08:00–12:00, занято 09:00–10:00
+    points = dict(build_points(480, 720, 30, [(540, 600)]))
+    assert points[510] is True
+    assert points[540] is False
+    assert points[570] is False
+    assert points[600] is True
+    assert points[720] is True
+
+
+def test_build_points_single_free_slot_between_bookings_is_unavailable():
+    points = dict(build_points(480, 720, 60, [(480, 540), (600, 720)]))
+    assert points[540] is False
+
+
+def test_build_points_respects_current_time():
+    points = dict(build_points(480, 720, 15, [], now_min=500))
+    assert points[495] is False
+    assert points[510] is True
+
+
+@pytest.mark.django_db
+def test_available_time_uses_venue_granularity(api_client, user, venue):
+    venue.slot_minutes = 30
+    venue.save()
+    date = timezone.now().date() + timedelta(days=1)
+    booking = Booking.objects.create(user=user, stadium=venue, start_time=_local(date, 10),
+                                     end_time=_local(date, 11, 30), amount=Decimal("150000.00"))
+    refresh_booking_occupancy(booking)
+
+    resp = api_client.get(f"/api/sport-venues/{venue.id}/available-time/", {"date": date.isoformat()})
+    assert resp.status_code == 200
+    assert resp.json()["slot_minutes"] == 30
+    points = {p["time"]: p["is_available"] for p in resp.json()["time_points"]}
+    assert points["09:30"] is True
+    assert points["11:00"] is False
+    assert points["11:30"] is True
+
+
+@pytest.mark.django_db
+def test_booking_must_be_on_venue_grid(venue):
+    date = timezone.now().date() + timedelta(days=1)
+    data = {"stadium": venue.id, "payment_method": Booking.PAYMENT_CASH}
+
+    serializer = BookingCreateSerializer(data={
+        **data, "start_time": _local(date, 10, 30), "end_time": _local(date, 11, 30),
+    })
+    assert not serializer.is_valid()
+
+    venue.slot_minutes = 30
+    venue.save()
+    serializer = BookingCreateSerializer(data={
+        **data, "start_time": _local(date, 10, 30), "end_time": _local(date, 11, 30),
+    })
+    assert serializer.is_valid(), serializer.errors
@@ -0,0 +1,62 @@
+import gzip
+import json
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import SportVenue
+
+
+@pytest.mark.django_db
+def test_snapshot_is_rebuilt_when_venue_changes(api_client, media_root, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        venue = SportVenue.objects.create(name="Arena", description="", price_per_hour=Decimal("50000.00"),
+                                          latitude=Decimal("41.311081"), longitude=Decimal("69.240562"))
+
+    resp = api_client.get("/api/sport-venues/map/snapshot/")
+    assert resp.status_code == 200
+    version = resp.json()["version"]
+    assert resp.json()["url"].endswith(f"/media/snapshots/map-{version}.json")
+
+    path = media_root / "snapshots" / f"map-{version}.json"
+    data = json.loads(path.read_bytes())
+    assert data == json.loads(gzip.decompress((media_root / "snapshots" / f"map-{version}.json.gz").read_bytes()))
+    assert data["venues"][0]["id"] == venue.id
+    assert data["venues"][0]["price_per_hour"] == "50000.00"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        venue.name = "Arena 2"
+        venue.save()
+
+    new_version = api_client.get("/api/sport-venues/map/snapshot/").json()["version"]
+    assert new_version != version
+    new_data = json.loads((media_root / "snapshots" / f"map-{new_version}.json").read_bytes())
+    assert new_data["venues"][0]["name"] == "Arena 2"
+
+
+@pytest.mark.django_db
+def test_snapshot_rebuilt_once_per_transaction(monkeypatch, django_capture_on_commit_callbacks):
+    from django.db import transaction
+    from playgrounds import snapshot
+
+    builds = []
+    monkeypatch.setattr(snapshot, "build_map_snapshot", lambda: builds.append(1))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            for index in range(5):
+                SportVenue.objects.create(name=f"Arena {index}", description="",
+                                          price_per_hour=Decimal("50000.00"))
+
+    assert builds == [1]
+
+
+@pytest.mark.django_db
+def test_stale_snapshot_served_while_another_request_rebuilds(monkeypatch):
+    from django.core.cache import cache
+    from playgrounds import snapshot
+
+    cache.set(snapshot.SNAPSHOT_KEY, {"version": "old", "catalog_version": -1}, None)
+    cache.add(snapshot.REBUILD_LOCK_KEY, 1)
+    monkeypatch.setattr(snapshot, "build_map_snapshot", lambda: pytest.fail("rebuilt twice"))
+
+    assert snapshot.get_map_snapshot_version() == "old"
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from playgrounds import filters
+from playgrounds.models import SportVenue, SportVenueType
+from playgrounds.spatial import NEAR_MAX_RADIUS_KM, VenueIndex, haversine_km
+
+
+def test_index_radius_query_matches_brute_force():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(37.0, 45.0, 5000)
+    lons = rng.uniform(56.0, 73.0, 5000)
+    index = VenueIndex(np.arange(5000), lats, lons)
+
+    ids, distances = index.nearest(41.3, 69.24, radius_km=25)
+
+    brute = haversine_km(41.3, 69.24, lats, lons)
+    expected = np.flatnonzero(brute <= 25)
+    assert sorted(ids.tolist()) == sorted(expected.tolist())
+    assert np.all(np.diff(distances) >= 0)
+
+
+def test_index_without_radius_returns_limited_nearest():
+    index = VenueIndex([1, 2, 3], [41.30, 41.35, 39.65], [69.24, 69.30, 66.96])
+    ids, _ = index.nearest(41.31, 69.25, limit=2)
+    assert ids.tolist() == [1, 2]
+
+
+def test_index_radius_query_is_limited():
+    index = VenueIndex([1, 2, 3], [41.30, 41.35, 41.40], [69.24, 69.30, 69.30])
+    ids, _ = index.nearest(41.31, 69.25, radius_km=50, limit=2)
+    assert ids.tolist() == [1, 2]
+
+
+@pytest.mark.django_db
+def test_list_near_clamps_radius(api_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        close = SportVenue.objects.create(name="Close", description="", price_per_hour=Decimal("1"),
+                                          latitude=Decimal("41.312000"), longitude=Decimal("69.241000"))
+        # Самарканд ~270 км от Ташкента — дальше максимального радиуса
+        SportVenue.objects.create(name="Samarkand", description="", price_per_hour=Decimal("1"),
+                                  latitude=Decimal("39.654167"), longitude=Decimal("66.959722"))
+
+    resp = api_client.get("/api/sport-venues/", {"near": "41.311081,69.240562", "radius_km": 10000})
+    assert resp.status_code == 200
+    assert [v["id"] for v in resp.json()["results"]] == [close.id]
+    assert NEAR_MAX_RADIUS_KM < 270
+
+
+@pytest.mark.django_db
+def test_list_near_sorts_by_distance_and_filters_radius(api_client, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        far = SportVenue.objects.create(name="Far", description="", price_per_hour=Decimal("1"),
+                                        latitude=Decimal("41.400000"), longitude=Decimal("69.300000"))
+        close = SportVenue.objects.create(name="Close", description="", price_per_hour=Decimal("1"),
+                                          latitude=Decimal("41.312000"), longitude=Decimal("69.241000"))
+        SportVenue.objects.create(name="Samarkand", description="", price_per_hour=Decimal("1"),
+                                  latitude=Decimal("39.654167"), longitude=Decimal("66.959722"))
+
+    resp = api_client.get("/api/sport-venues/", {"near": "41.311081,69.240562", "radius_km": 30})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [v["id"] for v in results] == [close.id, far.id]
+    assert results[0]["distance_km"] < 1 < results[1]["distance_km"]
+
+    assert api_client.get("/api/sport-venues/", {"near": "abc"}).status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("radius", [None, 30])
+def test_list_near_limits_after_other_filters(api_client, monkeypatch, django_capture_on_commit_callbacks, radius):
+    monkeypatch.setattr(filters, "NEAR_MAX_RESULTS", 1)
+    indoor = SportVenueType.objects.create(name="Тип near")
+    with django_capture_on_commit_callbacks(execute=True):
+        SportVenue.objects.create(name="Close", description="", price_per_hour=Decimal("1"),
+                                  latitude=Decimal("41.312000"), longitude=Decimal("69.241000"))
+        farther = SportVenue.objects.create(name="Farther", description="", price_per_hour=Decimal("1"),
+                                            sport_venue_type=indoor,
+                                            latitude=Decimal("41.400000"), longitude=Decimal("69.300000"))
+
+    params = {"near": "41.311081,69.240562", "sport_venue_type": indoor.id}
+    if radius:
+        params["radius_km"] = radius
+    results = api_client.get("/api/sport-venues/", params).json()["results"]
+    assert [v["id"] for v in results] == [farther.id]
+    assert results[0]["distance_km"] > 1
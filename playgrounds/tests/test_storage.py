@@ -0,0 +1,100 @@
+import hashlib
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from djangoProject.storage import ContentAddressedStorage
+
+from playgrounds.models import SportVenueImage
+
+
+def _png(color=(10, 120, 40)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 200), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_file_named_by_content_hash():
+    data = b"avatar bytes"
+
+    name = default_storage.save("user/profile/avatar/Me.JPG", ContentFile(data))
+
+    assert name == f"user/profile/avatar/{hashlib.sha256(data).hexdigest()}.jpg"
+    assert default_storage.is_hashed(name)
+    with default_storage.open(name) as f:
+        assert f.read() == data
+
+
+@pytest.mark.django_db
+def test_identical_uploads_stored_once(venue):
+    first = SportVenueImage.objects.create(sport_venue=venue, image=SimpleUploadedFile("a.png", _png()))
+    second = SportVenueImage.objects.create(sport_venue=venue, image=SimpleUploadedFile("b.png", _png()))
+
+    assert first.image.name == second.image.name
+    assert first.variants["files"] == second.variants["files"]
+    assert len(default_storage.listdir("sport_venue_images")[1]) == 1
+
+
+@pytest.mark.django_db
+def test_shared_variants_kept_when_one_photo_replaced(venue):
+    first = SportVenueImage.objects.create(sport_venue=venue, image=SimpleUploadedFile("a.png", _png()))
+    second = SportVenueImage.objects.create(sport_venue=venue, image=SimpleUploadedFile("b.png", _png()))
+    shared = second.variants["files"]["card"]["webp"]
+
+    first.image = SimpleUploadedFile("c.png", _png(color=(200, 30, 30)))
+    first.save()
+
+    assert first.variants["files"]["card"]["webp"] != shared
+    assert default_storage.exists(shared)
+
+
+@pytest.mark.django_db
+def test_hash_media_files_renames_legacy_files(venue, user, settings):
+    legacy = FileSystemStorage(location=settings.MEDIA_ROOT)
+    image_name = legacy.save("sport_venue_images/old.png", ContentFile(_png()))
+    variant_name = legacy.save("sport_venue_images/variants/old-thumb.webp", ContentFile(b"thumb"))
+    photo = SportVenueImage.objects.create(sport_venue=venue, image=SimpleUploadedFile("x.png", _png()))
+    variants = {"source": image_name, "files": {"thumb": {"webp": variant_name}}}
+    SportVenueImage.objects.filter(pk=photo.pk).update(image=image_name, variants=variants)
+    avatar_name = legacy.save("user/profile/avatar/me.jpg", ContentFile(b"avatar"))
+    type(user).objects.filter(pk=user.pk).update(photo=avatar_name)
+
+    call_command("hash_media_files", "--dry-run")
+    photo.refresh_from_db()
+    assert photo.image.name == image_name
+
+    call_command("hash_media_files", "--delete-old")
+
+    photo.refresh_from_db()
+    user.refresh_from_db()
+    assert default_storage.is_hashed(photo.image.name)
+    assert photo.variants["source"] == photo.image.name
+    assert default_storage.is_hashed(photo.variants["files"]["thumb"]["webp"])
+    assert user.photo.name == f"user/profile/avatar/{hashlib.sha256(b'avatar').hexdigest()}.jpg"
+    assert not legacy.exists(image_name)
+    assert not legacy.exists(avatar_name)
+
+
+def test_concurrent_duplicate_keeps_single_file(monkeypatch):
+    data = b"same bytes"
+    name = default_storage.save("sport_venue_images/a.jpg", ContentFile(data))
+    # Файл появился между проверкой exists() и записью (параллельная загрузка)
+    real_exists = ContentAddressedStorage.exists
+    checks = []
+
+    def exists(self, checked):
+        if checked == name and not checks:
+            checks.append(checked)
+            return False
+        return real_exists(self, checked)
+
+    monkeypatch.setattr(ContentAddressedStorage, "exists", exists)
+
+    assert default_storage.save("sport_venue_images/b.jpg", ContentFile(data)) == name
+    assert checks == [name]
+    assert default_storage.listdir("sport_venue_images")[1] == [name.rsplit("/", 1)[1]]
@@ -0,0 +1,46 @@
+import pytest
+from decimal import Decimal
+
+from playgrounds.models import Region, SportVenue, SportVenueImage
+
+
+def _create_venues(count, region):
+    for i in range(count):
+        venue = SportVenue.objects.create(name=f"Venue {i}", description="", price_per_hour=Decimal("1000.00"),
+                                          region=region)
+        SportVenueImage.objects.create(sport_venue=venue, image=f"sport_venue_images/{i}-a.jpg")
+        SportVenueImage.objects.create(sport_venue=venue, image=f"sport_venue_images/{i}-b.jpg")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("count", [2, 10])
+def test_list_query_count_does_not_grow_with_page(api_client, django_assert_num_queries, count):
+    _create_venues(count, Region.objects.create(name="Tashkent"))
+
+    # COUNT для пагинации + одна выборка страницы
+    with django_assert_num_queries(2):
+        resp = api_client.get("/api/sport-venues/")
+    assert resp.status_code == 200
+    assert len(resp.json()["results"]) == count
+
+
+@pytest.mark.django_db
+def test_list_returns_lean_representation(api_client):
+    region = Region.objects.create(name="Tashkent")
+    _create_venues(1, region)
+
+    venue = api_client.get("/api/sport-venues/").json()["results"][0]
+    assert venue["region"] == region.id
+    assert venue["image"].endswith("/media/sport_venue_images/0-a.jpg")
+    assert "images" not in venue and "owner" not in venue
+
+
+@pytest.mark.django_db
+def test_detail_query_count(api_client, django_assert_num_queries):
+    _create_venues(1, Region.objects.create(name="Tashkent"))
+    venue = SportVenue.objects.get()
+
+    # Площадка с владельцем/регионом/типом + фото
+    with django_assert_num_queries(2):
+        resp = api_client.get(f"/api/sport-venues/{venue.id}/")
+    assert len(resp.json()["images"]) == 2
@@ -0,0 +1,122 @@
+"""
+Фоновая обработка загруженных фото площадок.
+
+Пакетная загрузка (AdminSportVenueViewSet.upload_images) сохраняет только
+оригиналы и сразу отвечает 202. После фиксации транзакции работа Pillow
+(проверка, копии, метаданные — images.render_image) уходит в пул процессов,
+а результат записывается в БД и хранилище в процессе приложения.
+
+Пул процессов, а не потоков: Pillow держит GIL на части операций, и
+обработка 20 фото в потоках тормозила бы ответы воркера. Процессы
+запускаются через spawn — fork из многопоточного сервера небезопасен.
+Число процессов — settings.IMAGE_PROCESSING_WORKERS; 0 — обрабатывать
+в текущем процессе (для разработки).
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .cache import invalidate_catalog, invalidate_venue
+from .images import render_image, store_image_data
+from .models import SportVenueImage
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+# Завершения обработки (после записи результата), см. wait_for_processing()
+_pending = set()
+
+
+def get_executor():
+    """Общий пул процессов; None, если обработка в текущем процессе."""
+    global _executor
+    workers = getattr(settings, "IMAGE_PROCESSING_WORKERS", 0)
+    if not workers:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def schedule_image_processing(image_ids):
+    """Отправляет фото на обработку после фиксации текущей транзакции."""
+    image_ids = list(image_ids)
+    transaction.on_commit(lambda: _submit(image_ids))
+
+
+def _submit(image_ids):
+    executor = get_executor()
+    for image in SportVenueImage.objects.filter(id__in=image_ids).order_by("id"):
+        path = image.image.storage.path(image.image.name)
+        if executor is None:
+            try:
+                result = render_image(path)
+            except Exception as exc:
+                _reject(image.pk, exc)
+            else:
+                _apply(image.pk, result)
+            continue
+        completion = Future()
+        _pending.add(completion)
+        future = executor.submit(render_image, path)
+        future.add_done_callback(partial(_on_done, image.pk, completion))
+
+
+def _on_done(image_id, completion, future):
+    # Колбэк выполняется в служебном потоке пула — у него своё подключение к БД
+    try:
+        exc = future.exception()
+        if exc is not None:
+            _reject(image_id, exc)
+        else:
+            _apply(image_id, future.result())
+    except Exception as exc:
+        logger.error("Не удалось сохранить обработанное фото %s: %s", image_id, exc, exc_info=True)
+    finally:
+        close_old_connections()
+        _pending.discard(completion)
+        completion.set_result(image_id)
+
+
+def _apply(image_id, result):
+    image = SportVenueImage.objects.filter(pk=image_id).first()
+    if image is None:
+        # Фото удалили, пока оно обрабатывалось
+        return
+    image.apply_image_data(
+        store_image_data(image.image.storage, image.image.name, result, image.variants, keep=image.file_in_use)
+    )
+    # update() без сигналов — сбрасываем кэши сами. Снимок карты устаревает
+    # по версии каталога и пересобирается один раз при следующем запросе,
+    # а не после каждого обработанного фото
+    invalidate_venue(image.sport_venue_id)
+    invalidate_catalog()
+
+
+def _reject(image_id, exc):
+    """Файл не открылся как изображение — удаляем фото вместе с оригиналом."""
+    logger.warning("Фото %s отклонено при обработке: %s", image_id, exc)
+    image = SportVenueImage.objects.filter(pk=image_id).first()
+    if image is None:
+        return
+    name, storage = image.image.name, image.image.storage
+    in_use = image.file_in_use(name)
+    image.delete()
+    if not in_use:
+        storage.delete(name)
+
+
+def wait_for_processing(timeout=None):
+    """Ждёт, пока отправленные в пул фото будут обработаны и записаны."""
+    done, _ = wait(list(_pending), timeout=timeout)
+    return len(done)
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ClientSportVenueViewSet, FavoriteSportVenueViewSet, SportVenueTypeViewSet, RegionViewSet, ContactFormAPIView
+from .views import ClientSportVenueViewSet, FavoriteSportVenueViewSet, SportVenueTypeViewSet, RegionViewSet, ContactFormAPIView, venue_live_slots
 
 router = DefaultRouter()
 router.register(r'types', SportVenueTypeViewSet)
@@ -9,6 +9,7 @@ router.register(r'favorites', FavoriteSportVenueViewSet, basename='favorite')
 router.register(r'regions', RegionViewSet)
 
 urlpatterns = [
+    path('sport-venues/<int:pk>/live/', venue_live_slots, name='sport-venue-live'),
     path('', include(router.urls)),
     path('send-contact/', ContactFormAPIView.as_view(), name='send-contact'),
 ]
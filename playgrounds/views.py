@@ -1,29 +1,54 @@
+import asyncio
 import json
 import requests
 
+from asgiref.sync import sync_to_async
+
 from djangoProject import settings
+from djangoProject.utils import conditional_response
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, permissions, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework import status, mixins
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from datetime import datetime, timedelta, time
+from datetime import datetime, timedelta
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import OuterRef, Subquery
-from django.db import models
+from django.db.models import Exists, OuterRef
+from django.db import connection, models, transaction
 from rest_framework.views import APIView
 
-from bookings.models import Booking
+from .availability import MAX_RANGE_DAYS, build_time_points, get_busy_intervals
+from .cache import (
+    availability_validators,
+    get_catalog_modified,
+    get_catalog_version,
+    get_favorites_modified,
+    get_favorites_version,
+    get_or_build_availability,
+    get_venue_modified,
+    get_venue_version,
+    invalidate_favorites,
+    make_etag,
+)
+from .facets import compute_facets, facets_params, get_or_build_facets
 from .filters import SportVenueFilter
-from .models import SportVenue, SportVenueImage, SportVenueType, Region, FavoriteSportVenue
+from .geo import CLUSTER_MAX_ZOOM, cluster, in_bbox, parse_bbox, parse_zoom
+from .pubsub import CHANNEL, get_broker
+from .reference import REFERENCE_MAX_AGE, get_reference_data, reference_validators
+from .snapshot import get_map_snapshot_version, map_venues, snapshot_url
+from .models import SportVenue, SportVenueType, Region, FavoriteSportVenue, first_image_subquery
 from .serializers import (
+    SportVenueListSerializer,
     SportVenueSerializer,
     SportVenueTypeSerializer,
     RegionSerializer,
+    FavoriteBulkSerializer,
     FavoriteSportVenueSerializer
 )
 
@@ -36,24 +61,114 @@ logger = logging.getLogger(__name__)
 
 
 
-class SportVenueTypeViewSet(viewsets.ReadOnlyModelViewSet):
+class ReferenceListMixin:
+    """
+    Список справочника из кэша (см. reference.py) с ETag и публичным
+    Cache-Control: ответ одинаков для всех пользователей и зависит только от языка.
+    """
+    reference_section = None
+    # Параметры, при которых список берётся из кэша; остальные (сортировка, курсор) — запрос к БД
+    reference_params = {"page", "page_size"}
+
+    def list(self, request, *args, **kwargs):
+        if not set(request.query_params) <= self.reference_params:
+            return super().list(request, *args, **kwargs)
+
+        params = sorted(request.query_params.items())
+        etag, last_modified = reference_validators(self.reference_section, request.get_host(), params)
+        return conditional_response(
+            request, etag, last_modified, self._reference_list,
+            cache_control={"public": True, "max_age": REFERENCE_MAX_AGE},
+            vary=("Accept-Language",),
+        )
+
+    def _reference_list(self):
+        items = get_reference_data()[self.reference_section]
+        page = self.paginate_queryset(items)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(items)
+
+
+class SportVenueTypeViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = SportVenueType.objects.all()
     serializer_class = SportVenueTypeSerializer
     permission_classes = [permissions.AllowAny]
+    reference_section = "sport_venue_types"
 
-class RegionViewSet(viewsets.ReadOnlyModelViewSet):
+class RegionViewSet(ReferenceListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     permission_classes = [permissions.AllowAny]
+    reference_section = "regions"
 
 class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SportVenue.objects.all().prefetch_related('images', 'sport_venue_type', 'region')
+    queryset = SportVenue.objects.all()
     serializer_class = SportVenueSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = SportVenueFilter
     ordering_fields = ["id", "price_per_hour"]
 
+    def get_cursor_ordering(self, queryset):
+        """Ключ курсорной пагинации: расстояние при ?near=, иначе выбранная сортировка."""
+        if 'distance_km' in queryset.query.annotations:
+            return ("distance_km", "id")
+        if 'search_rank' in queryset.query.annotations:
+            return ("-search_rank", "id")
+        ordering = self.request.query_params.get("ordering")
+        if ordering == "price_per_hour":
+            return ("price_per_hour", "id")
+        if ordering == "-price_per_hour":
+            return ("-price_per_hour", "-id")
+        if ordering == "-id":
+            return ("-id",)
+        return ("id",)
+
+    def get_queryset(self):
+        if self.action == 'list':
+            # Для списка — только первое фото, одним подзапросом
+            return self._with_is_favorite(
+                SportVenue.objects.annotate(first_image=first_image_subquery()).order_by("id")
+            )
+        if self.action == 'retrieve':
+            return self._with_is_favorite(
+                SportVenue.objects
+                .select_related('owner', 'sport_venue_type', 'region')
+                .prefetch_related('images')
+            )
+        # Доступности нужны только часы работы площадки
+        return SportVenue.objects.all()
+
+    def _with_is_favorite(self, queryset):
+        """Флаг избранного для авторизованного пользователя — подзапросом, без лишних запросов."""
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset
+        favorites = FavoriteSportVenue.objects.filter(user=user, sport_venue=OuterRef("pk"))
+        return queryset.annotate(is_favorite=Exists(favorites))
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return SportVenueListSerializer
+        return SportVenueSerializer
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = list(SportVenueListSerializer.VALUES)
+        # Аннотации, по которым строится курсор (distance_km, search_rank), тоже нужны в строках
+        for extra in ('distance_km', 'search_rank', 'headline', 'is_favorite'):
+            if extra in queryset.query.annotations:
+                columns.append(extra)
+        # Словари вместо моделей: без создания объектов и вложенных сериализаторов
+        rows = queryset.values(*columns)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        return Response(self.get_serializer(rows, many=True).data)
+
     
     @swagger_auto_schema(
         operation_description="Проверить доступность площадки на определённую дату",
@@ -70,7 +185,6 @@ class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
     )
     @action(detail=True, methods=['get'], url_path='available-time')
     def available_time(self, request, pk=None):
-        sport_venue = self.get_object()
         date_str = request.query_params.get('date')
         tz_name = request.query_params.get('tz', 'Asia/Tashkent')
 
@@ -88,81 +202,158 @@ class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
         except pytz.UnknownTimeZoneError:
             return Response({'error': f'Неверная таймзона: {tz_name}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        tz_tashkent = pytz.timezone("Asia/Tashkent")
-        open_time = sport_venue.open_time   # time(8, 0)
-        close_time = sport_venue.close_time # time(23, 0)
+        def build():
+            sport_venue = self.get_object()
+            busy = get_busy_intervals(sport_venue, date, date)
+            slots, _ = build_time_points(sport_venue, date, busy.get(date, []), user_tz, timezone.now())
+            return {
+                "date": date_str,
+                "working_hours": {
+                    "start": sport_venue.open_time.strftime("%H:%M"),
+                    "end": sport_venue.close_time.strftime("%H:%M"),
+                },
+                "slot_minutes": sport_venue.slot_minutes,
+                "time_points": slots,
+                "timezone": tz_name,
+            }
+
+        return self._availability_response(request, f"{date}:{tz_name}", date, build)
 
-        open_hour = open_time.hour
-        close_hour = close_time.hour + 1
+    @swagger_auto_schema(
+        operation_description="Проверить доступность площадки на период (для календаря)",
+        manual_parameters=[
+            openapi.Parameter(
+                'from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                description='Первая дата периода в формате YYYY-MM-DD', required=True
+            ),
+            openapi.Parameter(
+                'to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format='date',
+                description=f'Последняя дата периода (включительно, не более {MAX_RANGE_DAYS} дней)', required=True
+            ),
+            openapi.Parameter(
+                'tz', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description='Таймзона клиента (например, Europe/London)', required=False
+            )
+        ]
+    )
+    @action(detail=True, methods=['get'], url_path='available-range')
+    def available_range(self, request, pk=None):
+        from_str = request.query_params.get('from')
+        to_str = request.query_params.get('to')
+        tz_name = request.query_params.get('tz', 'Asia/Tashkent')
+
+        # Проверка дат
+        try:
+            date_from = datetime.strptime(from_str, '%Y-%m-%d').date()
+            date_to = datetime.strptime(to_str, '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return Response({'error': 'Неверный формат даты. Используйте YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Текущее время
-        now_tashkent = timezone.now().astimezone(tz_tashkent)
-        now_client = timezone.now().astimezone(user_tz)
+        if date_from < timezone.now().date():
+            return Response({'error': 'Нельзя проверять дату в прошлом'}, status=status.HTTP_400_BAD_REQUEST)
+        if date_to < date_from:
+            return Response({'error': 'Дата "to" должна быть не раньше даты "from"'}, status=status.HTTP_400_BAD_REQUEST)
+        if (date_to - date_from).days >= MAX_RANGE_DAYS:
+            return Response({'error': f'Период не может превышать {MAX_RANGE_DAYS} дней'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Берём все брони за день
-        day_start = tz_tashkent.localize(datetime.combine(date, time(0, 0)))
-        day_end = tz_tashkent.localize(datetime.combine(date, time(23, 59, 59)))
+        # Проверка таймзоны клиента
+        try:
+            user_tz = pytz.timezone(tz_name)
+        except pytz.UnknownTimeZoneError:
+            return Response({'error': f'Неверная таймзона: {tz_name}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        bookings = Booking.objects.filter(
-            stadium=sport_venue,
-            start_time__lt=day_end,
-            end_time__gte=day_start,
-            status__in=[Booking.STATUS_PENDING, Booking.STATUS_CONFIRMED]
+        def build():
+            sport_venue = self.get_object()
+            # Все брони за период — одним запросом
+            busy = get_busy_intervals(sport_venue, date_from, date_to)
+            now = timezone.now()
+
+            days = []
+            date = date_from
+            while date <= date_to:
+                slots, is_fully_booked = build_time_points(sport_venue, date, busy.get(date, []), user_tz, now)
+                days.append({
+                    "date": date.strftime('%Y-%m-%d'),
+                    "time_points": slots,
+                    "is_fully_booked": is_fully_booked,
+                })
+                date += timedelta(days=1)
+
+            return {
+                "from": from_str,
+                "to": to_str,
+                "working_hours": {
+                    "start": sport_venue.open_time.strftime("%H:%M"),
+                    "end": sport_venue.close_time.strftime("%H:%M"),
+                },
+                "slot_minutes": sport_venue.slot_minutes,
+                "days": days,
+                "timezone": tz_name,
+            }
+
+        return self._availability_response(request, f"{date_from}:{date_to}:{tz_name}", date_from, build)
+
+    def retrieve(self, request, *args, **kwargs):
+        venue_id = self._venue_id()
+        if venue_id is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        # Карточка зависит от площадки, её фото и справочников (регион, тип),
+        # а для авторизованного пользователя — ещё и от его избранного (is_favorite)
+        etag_parts = ["venue", venue_id, get_venue_version(venue_id), get_catalog_version()]
+        last_modified = max(get_venue_modified(venue_id), get_catalog_modified())
+        user = request.user
+        if user.is_authenticated:
+            etag_parts += [user.pk, get_favorites_version(user.pk)]
+            last_modified = max(last_modified, get_favorites_modified(user.pk))
+        parent_retrieve = super().retrieve
+        return self._conditional(request, make_etag(*etag_parts), last_modified,
+                                 lambda: parent_retrieve(request, *args, **kwargs),
+                                 vary=("Authorization",))
+
+    def _venue_id(self):
+        try:
+            return int(self.kwargs[self.lookup_field])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _availability_response(self, request, params, date_from, build):
+        """
+        Ответ доступности: 304 по If-None-Match, иначе из кэша.
+        Площадка из URL загружается только при промахе кэша.
+        """
+        venue_id = self._venue_id()
+        if venue_id is None:
+            return Response(build())
+
+        etag, last_modified = availability_validators(venue_id, params, date_from)
+        return self._conditional(
+            request, etag, last_modified,
+            lambda: Response(get_or_build_availability(venue_id, params, date_from, build)),
         )
 
-        # ⏱ Занятые часы в Ташкенте
-        booked = set()
-        for b in bookings:
-            cur = b.start_time.astimezone(tz_tashkent)
-            end = b.end_time.astimezone(tz_tashkent)
-            while cur < end:
-                booked.add(cur.hour)
-                cur += timedelta(hours=1)
-
-        # Формируем все слоты (включая закрывающий час)
-        slots = []
-        for hour in range(open_hour, close_hour):
-            slot_tashkent = tz_tashkent.localize(datetime.combine(date, time(hour, 0)))
-            slot_client = slot_tashkent.astimezone(user_tz)
-
-            # По умолчанию доступно
-            is_available = True
-
-            # Если уже забронирован → False
-            if hour in booked:
-                is_available = False
-
-            # Если время прошло → False
-            if slot_client <= now_client:
-                is_available = False
-                
-            if (
-                is_available and
-                (hour - 1 in booked) and
-                (hour + 1 in booked)
-            ):
-                is_available = False
-
-            slots.append({
-                "time": slot_client.strftime("%H:%M"),
-                "is_available": is_available
-            })
-
-        return Response({
-            "date": date_str,
-            "working_hours": {
-                "start": open_time.strftime("%H:%M"),
-                "end": close_time.strftime("%H:%M"),
-            },
-            "time_points": slots,
-            "timezone": tz_name,
-        })
-       
-        
+    @staticmethod
+    def _conditional(request, etag, last_modified, respond, vary=()):
+        # Браузер и WebApp обязаны перепроверять ответ при каждом запросе
+        return conditional_response(request, etag, last_modified, respond, vary=vary)
+
     @swagger_auto_schema(
         method="get",
         operation_summary="Получить список стадионов для карты",
-        operation_description="Возвращает список стадионов с координатами и базовой информацией",
+        operation_description=(
+            "Возвращает стадионы с координатами и базовой информацией. "
+            "С bbox — только видимую область, с zoom до 14 включительно — кластеры по сетке."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description='Видимая область: min_lon,min_lat,max_lon,max_lat'
+            ),
+            openapi.Parameter(
+                'zoom', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                description='Зум карты (0–22)'
+            ),
+        ],
         responses={
             200: openapi.Response(
                 description="Успешный ответ",
@@ -178,6 +369,9 @@ class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
                                 "address": "г. Ташкент, ул. Амир Темур, 15",
                                 "images__image": "https://example.com/media/sport_venues/1/main.jpg"
                             }
+                        ],
+                        "clusters": [
+                            {"latitude": 41.3, "longitude": 69.25, "count": 12, "min_price": "40000.00"}
                         ]
                     }
                 }
@@ -187,33 +381,41 @@ class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=["get"], url_path="map")
     def map(self, request):
         try:
-            # Берем первое изображение каждого стадиона
-            first_image_subquery = SportVenueImage.objects.filter(
-                sport_venue=OuterRef("pk")
-            ).order_by("id").values("image")[:1]
-
-            venues = SportVenue.objects.annotate(
-                first_image=Subquery(first_image_subquery)
-            ).values(
-                "id", "name", "price_per_hour", "latitude", "longitude", "first_image"
+            bbox = parse_bbox(request.query_params['bbox']) if 'bbox' in request.query_params else None
+            zoom = parse_zoom(request.query_params['zoom']) if 'zoom' in request.query_params else None
+        except ValueError:
+            return Response(
+                {'error': 'Неверные параметры карты: bbox=min_lon,min_lat,max_lon,max_lat, zoom=0..22'},
+                status=status.HTTP_400_BAD_REQUEST
             )
 
-            results = []
-            image_url = request.build_absolute_uri(
-                
-            )
-            
-            for v in venues:
-                results.append({
-                    "id": v["id"],
-                    "name": v["name"],
-                    "price_per_hour": v["price_per_hour"],
-                    "latitude": v["latitude"],
-                    "longitude": v["longitude"],
-                    "image": request.build_absolute_uri(settings.MEDIA_URL + str(v["first_image"])) if v["first_image"] else None
-                })
+        etag = make_etag("map", get_catalog_version(), request.get_host(), bbox, zoom)
+        return self._conditional(request, etag, get_catalog_modified(),
+                                 lambda: self._map_response(request, bbox, zoom))
 
-            return Response({"venues": results}, status=status.HTTP_200_OK)
+    def _map_response(self, request, bbox, zoom):
+        try:
+            venues = SportVenue.objects.all()
+            if bbox is not None:
+                venues = in_bbox(venues, bbox)
+
+            clusters = []
+            if zoom is not None and zoom <= CLUSTER_MAX_ZOOM:
+                clusters, single_ids = cluster(venues, zoom)
+                venues = SportVenue.objects.filter(id__in=single_ids)
+
+            results = map_venues(venues)
+            for venue in results:
+                if venue["image"]:
+                    venue["image"] = request.build_absolute_uri(venue["image"])
+                for formats in venue["image_variants"].values():
+                    for fmt, url in formats.items():
+                        formats[fmt] = request.build_absolute_uri(url)
+
+            data = {"venues": results}
+            if zoom is not None and zoom <= CLUSTER_MAX_ZOOM:
+                data["clusters"] = clusters
+            return Response(data, status=status.HTTP_200_OK)
 
         except Exception as exc:
             logger.error("Ошибка при получении стадионов для карты: %s", exc, exc_info=True)
@@ -222,12 +424,190 @@ class ClientSportVenueViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Ссылка на готовый снимок карты",
+        operation_description=(
+            "Возвращает версию и адрес неизменяемого JSON-файла со всеми площадками "
+            "(формат как у /sport-venues/map/, ссылки на фото относительные). "
+            "Файл отдаётся статикой с долгим кэшем, рядом лежат .gz/.br."
+        ),
+        responses={200: openapi.Response(
+            description="Успешный ответ",
+            examples={"application/json": {
+                "version": "3f1c2a9b8d7e6f50",
+                "url": "https://polya.top/media/snapshots/map-3f1c2a9b8d7e6f50.json",
+            }},
+        )}
+    )
+    @action(detail=False, methods=["get"], url_path="map/snapshot")
+    def map_snapshot(self, request):
+        try:
+            version = get_map_snapshot_version()
+        except Exception as exc:
+            logger.error("Ошибка при сборке снимка карты: %s", exc, exc_info=True)
+            return Response(
+                {"detail": "Снимок карты недоступен"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        response = Response({
+            "version": version,
+            "url": request.build_absolute_uri(snapshot_url(version)),
+        })
+        # Сам указатель живёт недолго, файл по ссылке — вечно
+        patch_cache_control(response, public=True, max_age=60)
+        return response
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="Счётчики для панели фильтров",
+        operation_description=(
+            "Принимает те же параметры фильтра, что и список площадок, и возвращает "
+            "количество подходящих площадок по регионам, типам, удобствам и диапазонам цены."
+        ),
+        responses={200: openapi.Response(
+            description="Успешный ответ",
+            examples={"application/json": {
+                "total": 42,
+                "regions": [{"id": 1, "name": "Ташкент", "count": 30}],
+                "sport_venue_types": [{"id": 2, "name": "Футбол", "count": 25}],
+                "amenities": {"lights": 20, "lockers": 12, "showers": 9,
+                              "restrooms": 18, "walls": 7, "parking": 15},
+                "price": [{"from": None, "to": 100000, "key": "0-100000", "count": 10}],
+            }},
+        )}
+    )
+    @action(detail=False, methods=["get"], url_path="facets")
+    def facets(self, request):
+        params = facets_params(request.query_params, SportVenueFilter.base_filters)
+        # Фильтр применяем и при попадании в кэш: неверные параметры дают 400
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(get_or_build_facets(params, lambda: compute_facets(queryset)))
+
+
+# Живые обновления слотов (SSE). Работают под ASGI (uvicorn):
+# под WSGI каждое соединение держало бы отдельный поток воркера.
+LIVE_KEEPALIVE_SECONDS = 15
+# Соединение периодически закрывается, EventSource переподключается сам
+LIVE_MAX_SECONDS = 5 * 60
+LIVE_RETRY_MS = 3000
 
 
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
+def _release_connection():
+    # Поток держит соединение с БД всё время жизни SSE — без закрытия каждый
+    # зритель занимал бы подключение Postgres между редкими чтениями.
+    # Внутри транзакции (тесты) закрывать нельзя.
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+def _load_time_points(sport_venue, date, user_tz):
+    try:
+        busy = get_busy_intervals(sport_venue, date, date)
+        slots, _ = build_time_points(sport_venue, date, busy.get(date, []), user_tz, timezone.now())
+        return slots
+    finally:
+        _release_connection()
+
+
+def _reload_venue(pk):
+    try:
+        return SportVenue.objects.filter(pk=pk).first()
+    finally:
+        _release_connection()
+
+
+async def _live_slots_stream(sport_venue, date, user_tz):
+    """
+    Поток SSE: сначала snapshot — все точки дня, затем delta — только
+    изменившиеся точки после каждой публикации по площадке.
+    """
+    load = sync_to_async(_load_time_points)
+    reload_venue = sync_to_async(_reload_venue)
+    date_iso = date.isoformat()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LIVE_MAX_SECONDS
+
+    yield f"retry: {LIVE_RETRY_MS}\n\n"
+
+    # Подписываемся до снимка, чтобы не потерять изменение между ними
+    async with get_broker().subscribe(CHANNEL.format(sport_venue.pk)) as queue:
+        points = await load(sport_venue, date, user_tz)
+        bucket = timezone.now().replace(second=0, microsecond=0)
+        yield _sse("snapshot", {"date": date_iso, "time_points": points})
+
+        while loop.time() < deadline:
+            try:
+                message = await asyncio.wait_for(queue.get(), LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message is None:
+                # Слоты ещё и «протухают» со временем — пересчитываем раз в минуту
+                now = timezone.now().replace(second=0, microsecond=0)
+                if now == bucket:
+                    yield ": keepalive\n\n"
+                    continue
+                bucket = now
+            elif message["dates"] is None:
+                # Изменилась сама площадка (часы работы, шаг слотов)
+                sport_venue = await reload_venue(sport_venue.pk)
+                if sport_venue is None:
+                    yield _sse("closed", {"date": date_iso})
+                    return
+            elif date_iso not in message["dates"]:
+                continue
+
+            new_points = await load(sport_venue, date, user_tz)
+            if [p["time"] for p in new_points] != [p["time"] for p in points]:
+                yield _sse("snapshot", {"date": date_iso, "time_points": new_points})
+            else:
+                changes = [new for old, new in zip(points, new_points) if old != new]
+                if changes:
+                    yield _sse("delta", {"date": date_iso, "time_points": changes})
+                elif message is None:
+                    yield ": keepalive\n\n"
+            points = new_points
+
+
+@require_GET
+async def venue_live_slots(request, pk):
+    """SSE-поток состояния слотов площадки на дату (вместо опроса available-time)."""
+    date_str = request.GET.get('date')
+    tz_name = request.GET.get('tz', 'Asia/Tashkent')
+
+    try:
+        date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return JsonResponse({'error': 'Неверный формат даты. Используйте YYYY-MM-DD'}, status=400)
+    if date < timezone.now().date():
+        return JsonResponse({'error': 'Нельзя проверять дату в прошлом'}, status=400)
+
+    try:
+        user_tz = pytz.timezone(tz_name)
+    except pytz.UnknownTimeZoneError:
+        return JsonResponse({'error': f'Неверная таймзона: {tz_name}'}, status=400)
+
+    try:
+        sport_venue = await SportVenue.objects.aget(pk=pk)
+    except SportVenue.DoesNotExist:
+        return JsonResponse({'detail': 'Площадка не найдена'}, status=404)
+
+    response = StreamingHttpResponse(
+        _live_slots_stream(sport_venue, date, user_tz),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # nginx не должен буферизовать поток
+    response["X-Accel-Buffering"] = "no"
+    return response
+
 
-        
 class FavoriteSportVenueViewSet(
     mixins.ListModelMixin,       # GET /favorites/
     mixins.CreateModelMixin,     # POST /favorites/
@@ -236,15 +616,63 @@ class FavoriteSportVenueViewSet(
 ):
     serializer_class = FavoriteSportVenueSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "id")
 
     def get_queryset(self):
         if self.request.user.is_anonymous:
             return FavoriteSportVenue.objects.none()
-        return FavoriteSportVenue.objects.filter(user=self.request.user).select_related("sport_venue")
+        return (
+            FavoriteSportVenue.objects.filter(user=self.request.user)
+            .select_related("sport_venue__owner", "sport_venue__sport_venue_type", "sport_venue__region")
+            .prefetch_related("sport_venue__images")
+        )
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def _favorite_ids(self):
+        return list(
+            FavoriteSportVenue.objects.filter(user=self.request.user)
+            .order_by("-created_at", "id")
+            .values_list("sport_venue_id", flat=True)
+        )
+
+    @swagger_auto_schema(
+        method="get",
+        operation_summary="ID избранных площадок",
+        operation_description="Только id площадок (новые первыми) — чтобы отметить избранное в списке.",
+        responses={200: openapi.Response(description="Успешный ответ", examples={"application/json": {"ids": [3, 7]}})}
+    )
+    @action(detail=False, methods=["get"])
+    def ids(self, request):
+        return Response({"ids": self._favorite_ids()})
+
+    @swagger_auto_schema(
+        method="post",
+        operation_summary="Добавить и удалить несколько площадок из избранного",
+        request_body=FavoriteBulkSerializer,
+        responses={200: openapi.Response(description="ID избранных площадок после изменения",
+                                         examples={"application/json": {"ids": [3, 7]}})}
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        serializer = FavoriteBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add = set(serializer.validated_data["add"])
+        remove = set(serializer.validated_data["remove"]) - add
+
+        with transaction.atomic():
+            if add:
+                FavoriteSportVenue.objects.bulk_create(
+                    [FavoriteSportVenue(user=request.user, sport_venue_id=venue_id) for venue_id in sorted(add)],
+                    ignore_conflicts=True,
+                )
+                # bulk_create не отправляет post_save
+                invalidate_favorites(request.user.pk)
+            if remove:
+                FavoriteSportVenue.objects.filter(user=request.user, sport_venue_id__in=remove).delete()
+        return Response({"ids": self._favorite_ids()})
+
 
 
 def welcome(request):